@@ -1 +0,0 @@
-cd /home/ml/agentic-ai-trading-system/agentic-trading/backend
@@ -0,0 +1,114 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List, Optional, Union
+import asyncio
+import logging
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+
+class AgentInput(BaseModel):
+    symbol: str
+    timeframe: str
+    data: Dict
+    context: Optional[Dict] = None
+
+
+class AgentOutput(BaseModel):
+    agent_name: str
+    timestamp: datetime
+    symbol: str
+    confidence: float
+    signal_type: Optional[str] = None
+    reasoning: str
+    data: Dict
+    metadata: Optional[Dict] = None
+
+
+class AgentBatchInput(BaseModel):
+    # Items are validated one by one so a bad item fails alone
+    items: List[Dict]
+
+
+class AgentBatchResult(BaseModel):
+    index: int
+    result: Optional[AgentOutput] = None
+    error: Optional[str] = None
+
+
+class AgentBatchOutput(BaseModel):
+    results: List[AgentBatchResult]
+
+
+class AgentModel(ABC):
+    """Base class for AI model integration; agents implement ``predict``"""
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        self.initialized = False
+        self.load_model()
+
+    def load_model(self):
+        """Load the AI model"""
+        # TODO: Integrate with actual AI model (Mistral, Kimi, etc.)
+        logger.info(f"Loading {self.model_name} model...")
+        self.initialized = True
+        logger.info(f"{self.model_name} model loaded successfully")
+
+    @abstractmethod
+    async def predict(self, input_data: Dict) -> Dict:
+        """Make prediction using the AI model"""
+        pass
+
+    async def predict_batch(self, inputs: List[Dict]) -> List[Union[Dict, Exception]]:
+        """Predictions for ``inputs`` in order; a failed item's slot holds its exception.
+
+        Runs ``predict`` per item concurrently; models that can vectorize
+        over the batch override this.
+        """
+        return await asyncio.gather(*(self.predict(item) for item in inputs), return_exceptions=True)
+
+
+class AgentUtils:
+    """Utility functions shared by every agent"""
+
+    # Simple weighted average - override per agent
+    CONFIDENCE_WEIGHTS = {
+        "strength": 0.4,
+        "volume": 0.3,
+        "trend": 0.2,
+        "volatility": 0.1
+    }
+
+    @staticmethod
+    def validate_input(data: Dict) -> bool:
+        """Validate input data format"""
+        required_fields = ["symbol", "timeframe"]
+        return all(field in data for field in required_fields)
+
+    @classmethod
+    def calculate_confidence(cls, factors: Dict) -> float:
+        """Calculate confidence score based on multiple factors"""
+        if not factors:
+            return 0.0
+
+        score = 0.0
+        total_weight = 0.0
+
+        for factor, value in factors.items():
+            if factor in cls.CONFIDENCE_WEIGHTS:
+                score += cls.CONFIDENCE_WEIGHTS[factor] * value
+                total_weight += cls.CONFIDENCE_WEIGHTS[factor]
+
+        return min(max(score / total_weight if total_weight > 0 else 0.0, 0.0), 1.0)
+
+    @staticmethod
+    def format_output(analysis: Dict) -> Dict:
+        """Format analysis output for consistency"""
+        return {
+            "analysis": analysis,
+            "timestamp": datetime.now().isoformat(),
+            "version": "1.0"
+        }
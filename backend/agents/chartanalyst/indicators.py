@@ -0,0 +1,238 @@
+# backend/agents/chartanalyst/indicators.py
+"""Vectorized technical indicators over columnar OHLCV arrays.
+
+Every function works along the last axis, so a 1-D array is one price
+series and a 2-D ``(n_symbols, n_bars)`` array computes all symbols in one
+pass. Rows must be aligned and gap-free. Values are NaN until enough bars
+are available. Recursive indicators (EMA, RSI, ATR) use TA-Lib seeding,
+which is the SMA of the first ``period`` values followed by the recursive
+update.
+
+Callers that only need the latest values should pass the last ``LOOKBACK``
+bars: the recursive indicators forget their seed exponentially, so over
+that window they match the full-history values to within 1e-9.
+"""
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# Bars needed for the latest values: the slowest decay, Wilder's 13/14 per
+# bar for RSI/ATR, falls below 1e-9 after 280 bars
+LOOKBACK = 300
+
+# Largest total decay exponent the closed-form EWM handles (float64 headroom)
+_MAX_DECAY_EXPONENT = 500.0
+
+
+def _as_float(x) -> np.ndarray:
+    return np.asarray(x, dtype=np.float64)
+
+
+def _ewm(x: np.ndarray, alpha: float) -> np.ndarray:
+    """Recursive y[t] = alpha * x[t] + (1 - alpha) * y[t-1], y[0] = x[0]"""
+    rows = np.atleast_2d(x)
+    n = rows.shape[-1]
+    if n * -np.log1p(-alpha) < _MAX_DECAY_EXPONENT and not np.isnan(rows).any():
+        # Closed form, y[t] = (1 - alpha)^t * (x[0] + sum alpha * x[k] / (1 - alpha)^k),
+        # avoids pandas' per-call overhead on short windows
+        decay = (1.0 - alpha) ** np.arange(n)
+        terms = rows * (alpha / decay)
+        terms[..., 0] = rows[..., 0]
+        result = np.cumsum(terms, axis=-1) * decay
+    else:
+        result = pd.DataFrame(rows.T).ewm(alpha=alpha, adjust=False).mean().to_numpy().T
+    return result.reshape(x.shape)
+
+
+def _seeded_ewm(x: np.ndarray, alpha: float, period: int, start: int = 0) -> np.ndarray:
+    """EWM seeded with the mean of ``x[start:start + period]``"""
+    out = np.full(x.shape, np.nan)
+    first = start + period - 1
+    if x.shape[-1] <= first:
+        return out
+    tail = x[..., first:].copy()
+    tail[..., 0] = x[..., start:first + 1].mean(axis=-1)
+    out[..., first:] = _ewm(tail, alpha)
+    return out
+
+
+def _rolling_sums(x: np.ndarray, window: int):
+    """Windowed sums of x and x**2 (mean-centered to limit cancellation)"""
+    centered = x - x[..., :1]
+    cs = np.cumsum(centered, axis=-1)
+    cs2 = np.cumsum(centered * centered, axis=-1)
+    s = cs[..., window - 1:].copy()
+    s2 = cs2[..., window - 1:].copy()
+    s[..., 1:] -= cs[..., :-window]
+    s2[..., 1:] -= cs2[..., :-window]
+    return s, s2
+
+
+def sma(x, window: int) -> np.ndarray:
+    """Simple moving average"""
+    x = _as_float(x)
+    out = np.full(x.shape, np.nan)
+    if x.shape[-1] < window:
+        return out
+    s, _ = _rolling_sums(x, window)
+    out[..., window - 1:] = s / window + x[..., :1]
+    return out
+
+
+def ema(x, period: int) -> np.ndarray:
+    """Exponential moving average, alpha = 2 / (period + 1)"""
+    return _seeded_ewm(_as_float(x), 2.0 / (period + 1), period)
+
+
+def rsi(close, period: int = 14) -> np.ndarray:
+    """Wilder's relative strength index (0-100)"""
+    close = _as_float(close)
+    out = np.full(close.shape, np.nan)
+    if close.shape[-1] <= period:
+        return out
+    delta = np.diff(close, axis=-1)
+    avg_gain = _seeded_ewm(np.clip(delta, 0, None), 1.0 / period, period)
+    avg_loss = _seeded_ewm(np.clip(-delta, 0, None), 1.0 / period, period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    # No losses: 100, or neutral 50 for a completely flat window
+    value = np.where(avg_loss == 0, np.where(avg_gain == 0, 50.0, 100.0), value)
+    out[..., 1:] = np.where(np.isnan(avg_gain), np.nan, value)
+    return out
+
+
+def macd(close, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, np.ndarray]:
+    """MACD line, signal line and histogram"""
+    close = _as_float(close)
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = _seeded_ewm(line, 2.0 / (signal + 1), signal, start=slow - 1)
+    return {"macd": line, "signal": signal_line, "hist": line - signal_line}
+
+
+def true_range(high, low, close) -> np.ndarray:
+    high, low, close = _as_float(high), _as_float(low), _as_float(close)
+    tr = high - low
+    prev_close = close[..., :-1]
+    tr[..., 1:] = np.maximum.reduce([
+        tr[..., 1:],
+        np.abs(high[..., 1:] - prev_close),
+        np.abs(low[..., 1:] - prev_close),
+    ])
+    return tr
+
+
+def atr(high, low, close, period: int = 14) -> np.ndarray:
+    """Wilder's average true range (first bar's range is not used)"""
+    return _seeded_ewm(true_range(high, low, close), 1.0 / period, period, start=1)
+
+
+def bollinger(close, window: int = 20, num_std: float = 2.0) -> Dict[str, np.ndarray]:
+    """Bollinger bands around the SMA using population standard deviation"""
+    close = _as_float(close)
+    middle = sma(close, window)
+    std = np.full(close.shape, np.nan)
+    if close.shape[-1] >= window:
+        s, s2 = _rolling_sums(close, window)
+        std[..., window - 1:] = np.sqrt(np.clip(s2 / window - (s / window) ** 2, 0, None))
+    return {"upper": middle + num_std * std, "middle": middle, "lower": middle - num_std * std}
+
+
+def vwap(high, low, close, volume) -> np.ndarray:
+    """Cumulative volume-weighted average of the typical price"""
+    high, low, close, volume = _as_float(high), _as_float(low), _as_float(close), _as_float(volume)
+    typical = (high + low + close) / 3.0
+    cum_volume = np.cumsum(volume, axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(cum_volume > 0, np.cumsum(typical * volume, axis=-1) / cum_volume, np.nan)
+
+
+def compute_indicators(high, low, close, volume=None) -> Dict[str, np.ndarray]:
+    """Compute the full indicator set in one pass over aligned OHLCV arrays"""
+    close = _as_float(close)
+    high = close if high is None else _as_float(high)
+    low = close if low is None else _as_float(low)
+
+    result = {
+        "sma_10": sma(close, 10),
+        "sma_20": sma(close, 20),
+        "ema_12": ema(close, 12),
+        "ema_26": ema(close, 26),
+        "rsi_14": rsi(close, 14),
+        "atr_14": atr(high, low, close, 14),
+    }
+    for name, values in macd(close).items():
+        result["macd" if name == "macd" else f"macd_{name}"] = values
+    for name, values in bollinger(close).items():
+        result[f"bb_{name}"] = values
+    if volume is not None:
+        result["vwap"] = vwap(high, low, close, volume)
+    return result
+
+
+def _seeded_ewm_last(x: np.ndarray, alpha: float, period: int, start: int = 0) -> float:
+    """Last value of ``_seeded_ewm`` over a 1-D array, as one dot product"""
+    first = start + period - 1
+    if x.shape[-1] <= first:
+        return np.nan
+    rest = x[first + 1:]
+    weights = alpha * (1.0 - alpha) ** np.arange(len(rest) - 1, -1, -1)
+    return (1.0 - alpha) ** len(rest) * x[start:first + 1].mean() + weights @ rest
+
+
+def latest_indicators(high, low, close, volume=None) -> Dict[str, Optional[float]]:
+    """Latest value of every ``compute_indicators`` series (None until enough
+    bars) for one symbol, without building the series"""
+    close = _as_float(close)
+    high = close if high is None else _as_float(high)
+    low = close if low is None else _as_float(low)
+    n = len(close)
+
+    def last_sma(window):
+        return close[-window:].mean() if n >= window else np.nan
+
+    def last_rsi(period=14):
+        if n <= period:
+            return np.nan
+        delta = np.diff(close)
+        avg_gain = _seeded_ewm_last(np.clip(delta, 0, None), 1.0 / period, period)
+        avg_loss = _seeded_ewm_last(np.clip(-delta, 0, None), 1.0 / period, period)
+        if avg_loss == 0:
+            return 50.0 if avg_gain == 0 else 100.0
+        return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    # The signal line needs the MACD line series, the rest only the last bar
+    line = ema(close, 12) - ema(close, 26)
+    macd_line = line[-1] if n else np.nan
+    macd_signal = _seeded_ewm_last(line, 2.0 / 10, 9, start=25)
+    bb_middle = last_sma(20)
+    bb_std = close[-20:].std() if n >= 20 else np.nan
+
+    result = {
+        "sma_10": last_sma(10),
+        "sma_20": bb_middle,
+        "ema_12": _seeded_ewm_last(close, 2.0 / 13, 12),
+        "ema_26": _seeded_ewm_last(close, 2.0 / 27, 26),
+        "rsi_14": last_rsi(),
+        "atr_14": _seeded_ewm_last(true_range(high, low, close), 1.0 / 14, 14, start=1),
+        "macd": macd_line,
+        "macd_signal": macd_signal,
+        "macd_hist": macd_line - macd_signal,
+        "bb_upper": bb_middle + 2.0 * bb_std,
+        "bb_middle": bb_middle,
+        "bb_lower": bb_middle - 2.0 * bb_std,
+    }
+    if volume is not None:
+        volume = _as_float(volume)
+        total = volume.sum()
+        typical = (high + low + close) / 3.0
+        result["vwap"] = typical @ volume / total if total > 0 else np.nan
+    return {name: None if np.isnan(value) else float(value) for name, value in result.items()}
+
+
+def latest(values: np.ndarray) -> Optional[float]:
+    """Last value of a 1-D indicator series, or None if not yet available"""
+    if values.size == 0 or np.isnan(values[-1]):
+        return None
+    return float(values[-1])
@@ -0,0 +1,111 @@
+# backend/agents/chartanalyst/insight_cache.py
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class InsightCache:
+    """TTL cache with stale-while-revalidate for web-search insights.
+
+    Fresh entries (younger than their TTL) are served directly. Stale entries
+    (within ``stale_ttl`` past expiry) are served immediately while a single
+    background task refreshes them. Concurrent misses for the same query share
+    one fetch. A fetch returning ``None`` (no usable result) is not cached.
+    """
+
+    def __init__(self, default_ttl: float = 300.0, stale_ttl: float = 900.0, max_entries: int = 512):
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.ttl_overrides: Dict[str, float] = {}
+        self._entries: "OrderedDict[str, Tuple[float, float, str]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.metrics = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "refreshes": 0,
+            "refresh_errors": 0,
+        }
+
+    @staticmethod
+    def _key(query: str) -> str:
+        return " ".join(query.lower().split())
+
+    def set_ttl(self, query: str, ttl: float):
+        """Override the TTL for one query"""
+        self.ttl_overrides[self._key(query)] = ttl
+
+    def _store(self, key: str, value: str, ttl: float):
+        self._entries[key] = (time.monotonic(), ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _fetch(self, key: str, query: str, fetch: Callable[[str], Awaitable[Optional[str]]], ttl: float) -> asyncio.Task:
+        """Start (or join) the single fetch for ``key``"""
+        task = self._inflight.get(key)
+        if task is not None:
+            return task
+
+        async def run() -> Optional[str]:
+            try:
+                value = await fetch(query)
+                if value is not None:
+                    self._store(key, value, ttl)
+                return value
+            finally:
+                self._inflight.pop(key, None)
+
+        task = asyncio.create_task(run())
+        self._inflight[key] = task
+        return task
+
+    def _on_refresh_done(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            self.metrics["refresh_errors"] += 1
+            logger.warning(f"Background insight refresh failed: {task.exception()}")
+
+    async def get(
+        self,
+        query: str,
+        fetch: Callable[[str], Awaitable[Optional[str]]],
+        ttl: Optional[float] = None,
+    ) -> Optional[str]:
+        """Return insights for ``query``, fetching or refreshing as needed"""
+        key = self._key(query)
+        ttl = ttl if ttl is not None else self.ttl_overrides.get(key, self.default_ttl)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            fetched_at, entry_ttl, value = entry
+            age = time.monotonic() - fetched_at
+            if age < entry_ttl:
+                self.metrics["hits"] += 1
+                return value
+            if age < entry_ttl + self.stale_ttl:
+                self.metrics["stale_hits"] += 1
+                if key not in self._inflight:
+                    self.metrics["refreshes"] += 1
+                    self._fetch(key, query, fetch, ttl).add_done_callback(self._on_refresh_done)
+                return value
+
+        if key in self._inflight:
+            self.metrics["coalesced"] += 1
+        else:
+            self.metrics["misses"] += 1
+        return await asyncio.shield(self._fetch(key, query, fetch, ttl))
+
+    def stats(self) -> Dict:
+        served = self.metrics["hits"] + self.metrics["stale_hits"] + self.metrics["coalesced"]
+        lookups = served + self.metrics["misses"]
+        return {
+            **self.metrics,
+            "entries": len(self._entries),
+            "hit_rate": round(served / lookups, 4) if lookups else 0.0,
+        }
@@ -1,17 +1,31 @@
-# backend/agents/chartanalyst/main.py
-from prompts import generate_signal_prompt
+from agents.runtime import AgentService
+from config import settings
+from .model import model
+from .prompts import generate_signal_prompt
 from .mistral_client import query_mistral
 from .tavily_client import get_web_insights
 
-def chart_analyst_node(data: dict) -> dict:
+service = AgentService(
+    name="chartanalyst",
+    description="Chart patterns and technical analysis",
+    model=model,
+    port=settings.chartanalyst_port,
+    agent_type="technical_analysis",
+    default_reasoning="Chart pattern analysis",
+    data_fields={"candles": None},
+)
+app = service.app
+process_signal = service.process_signal
+
+async def chart_analyst_node(data: dict) -> dict:
     symbol = data.get("symbol", "EURUSD")
     timeframe = data.get("timeframe", "1h")
 
     print(f"[chart_analyst] Analyzing {symbol} on {timeframe}...")
 
-    insights = get_web_insights(f"{symbol} forex news")
+    insights = await get_web_insights(f"{symbol} forex news")
     prompt = generate_signal_prompt(symbol=symbol, timeframe=timeframe, web_insights=insights)
-    response = query_mistral(prompt)
+    response = await query_mistral(prompt, timeframe=timeframe)
 
     return {
         "agent": "chart_analyst",
@@ -19,3 +33,6 @@ def chart_analyst_node(data: dict) -> dict:
         "timeframe": timeframe,
         "signal": response
     }
+
+if __name__ == "__main__":
+    service.run()
@@ -1,11 +1,16 @@
 # backend/agents/chartanalyst/mistral_client.py
 import os
-import requests
+from typing import Optional
+
+from config import settings
+from agents.http_client import http_client
+from agents.llm_cache import llm_cache, prompt_key, candle_ttl
 
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
 API_URL = os.getenv("OPENROUTER_API_URL", "https://openrouter.ai/api/v1/chat/completions")
 
-def query_mistral(prompt: str):
+async def query_mistral(prompt: str, timeframe: Optional[str] = None):
+    """Query the LLM, caching the response until the current ``timeframe`` candle closes"""
     headers = {
         "Authorization": f"Bearer {OPENROUTER_API_KEY}",
         "Content-Type": "application/json"
@@ -20,6 +25,14 @@ def query_mistral(prompt: str):
         "temperature": 0.7
     }
 
-    response = requests.post(API_URL, headers=headers, json=data)
-    response.raise_for_status()
-    return response.json()['choices'][0]['message']['content']
+    async def fetch():
+        response = await http_client.post(API_URL, headers=headers, json=data)
+        response.raise_for_status()
+        return response.json()['choices'][0]['message']['content']
+
+    if not settings.llm_cache_enabled:
+        return await fetch()
+
+    key = prompt_key(data["model"], data["temperature"], data["messages"])
+    ttl = candle_ttl(timeframe, default=settings.llm_cache_default_ttl)
+    return await llm_cache.get_or_compute(key, fetch, ttl)
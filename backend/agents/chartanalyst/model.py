@@ -1,40 +1,19 @@
-from abc import ABC, abstractmethod
-from typing import Dict, Any
-import logging
-from datetime import datetime
+from typing import Dict, List, Optional, Union
 
-logger = logging.getLogger(__name__)
+import numpy as np
 
-class BaseModel(ABC):
-    """Base class for AI model integration"""
+from agents.base import AgentModel
+from agents.columnar import OHLCV
+from config import settings
+from .utils import LiveIndicators
 
-    def __init__(self, model_name: str = "chartanalyst_model"):
-        self.model_name = model_name
-        self.initialized = False
-
-    @abstractmethod
-    async def predict(self, input_data: Dict) -> Dict:
-        """Make prediction using the AI model"""
-        pass
-
-    @abstractmethod
-    def load_model(self):
-        """Load the AI model"""
-        pass
-
-class ChartanalystModel(BaseModel):
+class ChartanalystModel(AgentModel):
     """AI model for chartanalyst agent"""
 
     def __init__(self):
         super().__init__("chartanalyst_model")
-        self.load_model()
-
-    def load_model(self):
-        """Load the specific AI model for this agent"""
-        # TODO: Integrate with actual AI model (Mistral, Kimi, etc.)
-        logger.info(f"Loading {self.model_name} model...")
-        self.initialized = True
-        logger.info(f"{self.model_name} model loaded successfully")
+        # Streaming indicators per symbol, fed the new candles of each request
+        self.live_indicators = LiveIndicators(settings.chartanalyst_live_max_symbols)
 
     async def predict(self, input_data: Dict) -> Dict:
         """Make prediction using the loaded model"""
@@ -43,21 +22,56 @@ class ChartanalystModel(BaseModel):
 
         # TODO: Replace with actual model inference
         # This is a placeholder implementation
+        frame = OHLCV.coerce(input_data.get("candles"))
+        closes = frame.close
+        rising = len(closes) >= 2 and closes[-1] > closes[-2]
+        return self._with_indicators(self._prediction("BUY" if rising else "SELL"), input_data, frame)
 
-        
-prediction = {
-    "signal_type": "BUY" if input_data.get("candles", [{}])[-1].get("close", 0) > input_data.get("candles", [{}])[-2].get("close", 0) else "SELL",
-    "confidence": 0.75,
-    "pattern": "bullish_engulfing",
-    "price_zones": {
-        "support": 1970.0,
-        "resistance": 1980.0
-    },
-    "reasoning": "Strong bullish pattern detected with high volume confirmation"
-}
+    async def predict_batch(self, inputs: List[Dict]) -> List[Union[Dict, Exception]]:
+        """Vectorized ``predict``: one comparison over the last two closes of every input"""
+        if not self.initialized:
+            raise RuntimeError("Model not initialized")
 
+        results: List[Union[Dict, Exception, None]] = [None] * len(inputs)
+        frames: List[Optional[OHLCV]] = [None] * len(inputs)
+        last = np.full(len(inputs), np.nan)
+        prev = np.full(len(inputs), np.nan)
+        for i, item in enumerate(inputs):
+            try:
+                frames[i] = OHLCV.coerce(item.get("candles"))
+            except Exception as e:
+                results[i] = e
+                continue
+            closes = frames[i].close
+            if len(closes) >= 2:
+                last[i], prev[i] = closes[-1], closes[-2]
 
+        rising = last > prev  # NaN (too few closes) compares False, as in predict
+        return [
+            result if result is not None
+            else self._with_indicators(self._prediction("BUY" if up else "SELL"), item, frame)
+            for result, up, item, frame in zip(results, rising, inputs, frames)
+        ]
+
+    def _with_indicators(self, prediction: Dict, input_data: Dict, frame: OHLCV) -> Dict:
+        if len(frame):
+            prediction["indicators"] = self.live_indicators.update(
+                input_data.get("symbol"), input_data.get("timeframe"), frame
+            )
         return prediction
 
+    @staticmethod
+    def _prediction(signal_type: str) -> Dict:
+        return {
+            "signal_type": signal_type,
+            "confidence": 0.75,
+            "pattern": "bullish_engulfing",
+            "price_zones": {
+                "support": 1970.0,
+                "resistance": 1980.0
+            },
+            "reasoning": "Strong bullish pattern detected with high volume confirmation"
+        }
+
 # Global model instance
 model = ChartanalystModel()
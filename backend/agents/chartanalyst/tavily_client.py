@@ -1,10 +1,20 @@
 # backend/agents/chartanalyst/tavily_client.py
 import os
-import requests
+from typing import Optional
+
+from config import settings
+from agents.http_client import http_client
+from .insight_cache import InsightCache
 
 TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
 
-def get_web_insights(query: str) -> str:
+insight_cache = InsightCache(
+    default_ttl=settings.tavily_cache_ttl,
+    stale_ttl=settings.tavily_cache_stale_ttl,
+    max_entries=settings.tavily_cache_max_entries,
+)
+
+async def _search(query: str) -> Optional[str]:
     url = "https://api.tavily.com/search"
     payload = {
         "api_key": TAVILY_API_KEY,
@@ -12,7 +22,14 @@ def get_web_insights(query: str) -> str:
         "search_depth": "advanced",
         "include_answer": True,
     }
-    res = requests.post(url, json=payload)
+    res = await http_client.post(url, json=payload)
     if res.status_code == 200:
         return res.json().get("answer", "")
-    return "No web insights found."
+    return None
+
+async def get_web_insights(query: str, ttl: Optional[float] = None) -> str:
+    """Web insights for ``query``, served from cache for ``ttl`` seconds (default from settings)"""
+    insights = await insight_cache.get(query, _search, ttl=ttl)
+    if insights is None:
+        return "No web insights found."
+    return insights
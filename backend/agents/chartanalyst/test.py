@@ -1,4 +1,9 @@
-from main import chart_analyst_node
+import asyncio
+
+from agents.http_client import http_client
+from agents.llm_cache import llm_cache
+from .main import chart_analyst_node
+from .tavily_client import insight_cache
 
 # Test input
 test_data = {
@@ -6,7 +11,20 @@ test_data = {
     "timeframe": "1h"
 }
 
+async def main():
+    try:
+        result = await chart_analyst_node(test_data)
+        print("=== Agent Output ===")
+        print(result)
+        print("=== HTTP Client Stats ===")
+        print(http_client.stats())
+        print("=== LLM Cache Stats ===")
+        print(llm_cache.stats())
+        print("=== Insight Cache Stats ===")
+        print(insight_cache.stats())
+    finally:
+        await http_client.aclose()
+        await llm_cache.close()
+
 if __name__ == "__main__":
-    result = chart_analyst_node(test_data)
-    print("=== Agent Output ===")
-    print(result)
+    asyncio.run(main())
@@ -1,52 +1,18 @@
 import numpy as np
-import pandas as pd
-from typing import Dict, List, Tuple
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 import logging
 
+from agents.base import AgentUtils
+from agents.streaming_indicators import EMA, IndicatorSet, RollingMean, WilderRSI
+from agents.columnar import OHLCV
+from .indicators import LOOKBACK, latest_indicators
+
 logger = logging.getLogger(__name__)
 
-class ChartanalystUtils:
+class ChartanalystUtils(AgentUtils):
     """Utility functions for chartanalyst agent"""
 
-    @staticmethod
-    def validate_input(data: Dict) -> bool:
-        """Validate input data format"""
-        required_fields = ["symbol", "timeframe"]
-        return all(field in data for field in required_fields)
-
-    @staticmethod
-    def calculate_confidence(factors: Dict) -> float:
-        """Calculate confidence score based on multiple factors"""
-        if not factors:
-            return 0.0
-
-        # Simple weighted average - customize per agent
-        weights = {
-            "strength": 0.4,
-            "volume": 0.3,
-            "trend": 0.2,
-            "volatility": 0.1
-        }
-
-        score = 0.0
-        total_weight = 0.0
-
-        for factor, value in factors.items():
-            if factor in weights:
-                score += weights[factor] * value
-                total_weight += weights[factor]
-
-        return min(max(score / total_weight if total_weight > 0 else 0.0, 0.0), 1.0)
-
-    @staticmethod
-    def format_output(analysis: Dict) -> Dict:
-        """Format analysis output for consistency"""
-        return {
-            "analysis": analysis,
-            "timestamp": pd.Timestamp.now().isoformat(),
-            "version": "1.0"
-        }
-
 # Agent-specific utility functions
 
 def detect_patterns(candles: List[Dict]) -> Dict:
@@ -66,17 +32,101 @@ def detect_patterns(candles: List[Dict]) -> Dict:
         "resistance_levels": [random.uniform(200, 300) for _ in range(3)]
     }
 
-def calculate_indicators(candles: List[Dict]) -> Dict:
-    """Calculate technical indicators"""
-    if not candles:
+def calculate_indicators(candles) -> Dict:
+    """Calculate technical indicators (latest value of each, None until enough bars).
+
+    ``candles`` may be an ``OHLCV`` frame, a wire envelope or per-bar dicts.
+    Only the last ``LOOKBACK`` bars are read, so VWAP is anchored at the
+    start of that window. Bars without a close are skipped.
+    """
+    if candles is None:
         return {}
-    
-    # Simple moving averages (placeholder)
-    closes = [float(c.get("close", 0)) for c in candles[-20:]]
-    if len(closes) >= 10:
-        sma_10 = sum(closes[-10:]) / 10
-        sma_20 = sum(closes) / len(closes)
-        return {"sma_10": sma_10, "sma_20": sma_20}
-    
-    return {}
+    if isinstance(candles, (list, tuple)):
+        # Convert just the tail, not the whole history
+        candles = candles[-LOOKBACK:]
+    frame = OHLCV.coerce(candles).tail(LOOKBACK)
+    has_close = ~np.isnan(frame.close)
+    closes = frame.close[has_close]
+    if len(closes) < 10:
+        return {}
+
+    # Bars without high/low fall back to the close; volume is optional
+    high = np.where(np.isnan(frame.high[has_close]), closes, frame.high[has_close])
+    low = np.where(np.isnan(frame.low[has_close]), closes, frame.low[has_close])
+    volume = frame.volume[has_close]
+    volume = None if np.isnan(volume).all() else np.nan_to_num(volume)
+
+    result = latest_indicators(high, low, closes, volume)
+    # sma_20 keeps its original meaning: mean of up to the last 20 closes
+    result["sma_10"] = float(closes[-10:].mean())
+    result["sma_20"] = float(closes[-20:].mean())
+    return result
+
+def create_streaming_indicators() -> IndicatorSet:
+    """Per-symbol incremental indicators for live feeds; call ``update(close)`` per candle"""
+    return IndicatorSet({
+        "sma_10": RollingMean(10),
+        "sma_20": RollingMean(20),
+        "ema_12": EMA(12),
+        "ema_26": EMA(26),
+        "rsi_14": WilderRSI(14),
+    })
+
+class LiveIndicators:
+    """Streaming indicators per (symbol, timeframe) for live feeds.
+
+    The newest candle of a request may still be forming, so only the
+    candles before it are fed for good: each call feeds the ones newer than
+    the last it fed and evaluates the newest on a copy. A symbol polled with
+    a growing history costs O(new candles) instead of a full recomputation,
+    and a revised close of the newest candle is picked up. The indicators
+    are rebuilt from the last ``LOOKBACK`` closes on first sight, when the
+    history no longer overlaps what was fed, or when candles carry no
+    timestamps. The least recently used symbols are dropped beyond
+    ``max_symbols``.
+    """
+
+    def __init__(self, max_symbols: int = 10000):
+        self.max_symbols = max_symbols
+        self._symbols: "OrderedDict[Tuple[str, str], Tuple[int, IndicatorSet]]" = OrderedDict()
+        self.metrics = {"rebuilds": 0, "incremental": 0, "candles_fed": 0}
+
+    def update(self, symbol: str, timeframe: str, frame: OHLCV) -> Dict[str, Optional[float]]:
+        """Indicator values after the candles in ``frame``"""
+        key = (symbol, timeframe)
+        timestamps = frame.timestamp
+        # Missing timestamps are zeros: nothing to track the feed position by
+        tracked = len(frame) > 0 and timestamps[-1] > 0
+        entry = self._symbols.get(key) if tracked else None
+        if entry is not None and timestamps[0] <= entry[0] < timestamps[-1]:
+            last_fed, indicators = entry
+            closed = frame.close[:-1][timestamps[:-1] > last_fed]
+            self.metrics["incremental"] += 1
+        else:
+            last_fed, indicators = None, create_streaming_indicators()
+            closed = frame.close[-LOOKBACK:-1]
+            self.metrics["rebuilds"] += 1
+
+        closed = closed[~np.isnan(closed)]
+        for close in closed.tolist():
+            indicators.update(close)
+        self.metrics["candles_fed"] += len(closed)
+
+        if tracked:
+            if len(frame) > 1:
+                last_fed = int(timestamps[-2])
+            if last_fed is not None:
+                self._symbols[key] = (last_fed, indicators)
+                self._symbols.move_to_end(key)
+                while len(self._symbols) > self.max_symbols:
+                    self._symbols.popitem(last=False)
+
+        newest = frame.close[-1] if len(frame) else np.nan
+        if np.isnan(newest):
+            return indicators.values
+        current = indicators.copy() if tracked else indicators
+        current.update(float(newest))
+        return current.values
 
+    def stats(self) -> Dict:
+        return {**self.metrics, "symbols": len(self._symbols)}
@@ -0,0 +1,188 @@
+"""Columnar candle and tick containers shared by agents.
+
+``OHLCV`` and ``Ticks`` hold one NumPy array per field instead of a list of
+per-bar dicts. Slicing returns views (zero-copy). Frames convert to and from
+pandas and per-bar dicts, and have a compact binary wire format
+(``to_bytes``/``from_bytes``). ``from_bytes`` maps columns straight onto the
+received buffer. ``to_wire``/``from_wire`` wrap that format in base64 so it
+can travel inside JSON ``AgentInput.data``.
+
+Timestamps are int64 epoch milliseconds (UTC); every other column is
+float64.
+"""
+import base64
+import struct
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+_MAGIC = b"AGTC"
+_VERSION = 1
+_HEADER = struct.Struct("<4sBBHI")  # magic, version, kind, symbol length, rows
+WIRE_ENCODING = "agtc/v1"
+
+
+def _timestamps_ms(values: List) -> np.ndarray:
+    """Epoch-ms int64 array from numbers, ISO strings or datetimes.
+
+    Every row needs a timestamp: a missing one (None, NaN, NaT) raises
+    ValueError rather than becoming int64-min or 1970.
+    """
+    if all(isinstance(v, (int, float, np.integer, np.floating)) for v in values):
+        if np.isnan(np.asarray(values, dtype=np.float64)).any():
+            raise ValueError("Some rows have a NaN timestamp; give every row a timestamp or none")
+        return np.asarray(values, dtype=np.int64)
+    timestamps = pd.to_datetime(pd.Series(values), utc=True)
+    missing = int(timestamps.isna().sum())
+    if missing:
+        raise ValueError(f"{missing} of {len(values)} rows have no timestamp; give every row a timestamp or none")
+    return timestamps.to_numpy(dtype="datetime64[ms]").astype(np.int64)
+
+
+class ColumnarFrame:
+    """Base for fixed-schema columnar frames; subclasses set ``FIELDS`` and ``KIND``"""
+
+    FIELDS = ()
+    KIND = 0
+
+    def __init__(self, symbol: Optional[str] = None, **columns):
+        self.symbol = symbol
+        provided = [v for v in (columns.get(f) for f in self.FIELDS) if v is not None]
+        n = len(provided[0]) if provided else 0
+        for field in self.FIELDS:
+            dtype = np.int64 if field == "timestamp" else np.float64
+            values = columns.get(field)
+            if values is None:
+                # Missing columns: zero timestamps, NaN values
+                values = np.zeros(n, dtype=np.int64) if field == "timestamp" else np.full(n, np.nan)
+            array = np.asarray(values, dtype=dtype)
+            if len(array) != n:
+                raise ValueError(f"Column {field} has {len(array)} rows, expected {n}")
+            setattr(self, field, array)
+
+    def __len__(self) -> int:
+        return len(getattr(self, self.FIELDS[0]))
+
+    def __getitem__(self, key: slice) -> "ColumnarFrame":
+        """Slice rows; basic slices return views of the same buffers"""
+        if not isinstance(key, slice):
+            raise TypeError("Frames support slice indexing only, e.g. frame[-20:]")
+        return type(self)(self.symbol, **{f: getattr(self, f)[key] for f in self.FIELDS})
+
+    def tail(self, n: int) -> "ColumnarFrame":
+        return self[-n:] if n else self[0:0]
+
+    @property
+    def columns(self) -> Dict[str, np.ndarray]:
+        return {f: getattr(self, f) for f in self.FIELDS}
+
+    # --- per-bar dicts ---
+
+    @classmethod
+    def from_records(cls, records: List[Dict], symbol: Optional[str] = None) -> "ColumnarFrame":
+        n = len(records)
+        columns = {}
+        for field in cls.FIELDS:
+            values = [r.get(field) for r in records]
+            if field == "timestamp":
+                columns[field] = _timestamps_ms(values) if any(v is not None for v in values) else None
+            else:
+                columns[field] = np.fromiter(
+                    (v if v is not None else np.nan for v in values), dtype=np.float64, count=n
+                )
+        return cls(symbol, **columns)
+
+    def to_records(self) -> List[Dict]:
+        lists = {f: getattr(self, f).tolist() for f in self.FIELDS}
+        return [dict(zip(self.FIELDS, row)) for row in zip(*lists.values())]
+
+    # --- pandas ---
+
+    @classmethod
+    def from_pandas(cls, df: pd.DataFrame, symbol: Optional[str] = None) -> "ColumnarFrame":
+        """From a frame with a DatetimeIndex or a ``timestamp`` column"""
+        columns = {f: df[f].to_numpy() for f in cls.FIELDS if f != "timestamp" and f in df}
+        if "timestamp" in df:
+            columns["timestamp"] = _timestamps_ms(df["timestamp"].tolist())
+        elif isinstance(df.index, pd.DatetimeIndex):
+            index = df.index.tz_localize("UTC") if df.index.tz is None else df.index
+            columns["timestamp"] = index.to_numpy(dtype="datetime64[ms]").astype(np.int64)
+        return cls(symbol, **columns)
+
+    def to_pandas(self) -> pd.DataFrame:
+        index = pd.to_datetime(self.timestamp, unit="ms", utc=True)
+        return pd.DataFrame(
+            {f: getattr(self, f) for f in self.FIELDS if f != "timestamp"},
+            index=pd.DatetimeIndex(index, name="timestamp"),
+        )
+
+    # --- binary wire format ---
+
+    def to_bytes(self) -> bytes:
+        symbol = (self.symbol or "").encode("utf-8")
+        header = _HEADER.pack(_MAGIC, _VERSION, self.KIND, len(symbol), len(self))
+        padding = b"\0" * (-(len(header) + len(symbol)) % 8)
+        body = b"".join(
+            np.ascontiguousarray(getattr(self, f), dtype="<i8" if f == "timestamp" else "<f8").tobytes()
+            for f in self.FIELDS
+        )
+        return header + symbol + padding + body
+
+    @classmethod
+    def from_bytes(cls, buffer: Union[bytes, bytearray, memoryview]) -> "ColumnarFrame":
+        """Decode ``to_bytes`` output; columns are read-only views of ``buffer``"""
+        magic, version, kind, symbol_len, n = _HEADER.unpack_from(buffer, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Not an agent columnar frame (bad magic/version)")
+        if kind != cls.KIND:
+            raise ValueError(f"Frame kind {kind} cannot be decoded as {cls.__name__}")
+        offset = _HEADER.size
+        symbol = bytes(buffer[offset:offset + symbol_len]).decode("utf-8") or None
+        offset += symbol_len
+        offset += -offset % 8
+        columns = {}
+        for field in cls.FIELDS:
+            dtype = "<i8" if field == "timestamp" else "<f8"
+            columns[field] = np.frombuffer(buffer, dtype=dtype, count=n, offset=offset)
+            offset += n * 8
+        return cls(symbol, **columns)
+
+    def to_wire(self) -> Dict:
+        """JSON-safe envelope for ``AgentInput.data``"""
+        return {"encoding": WIRE_ENCODING, "payload": base64.b64encode(self.to_bytes()).decode("ascii")}
+
+    @classmethod
+    def from_wire(cls, envelope: Dict) -> "ColumnarFrame":
+        if envelope.get("encoding") != WIRE_ENCODING:
+            raise ValueError(f"Unsupported encoding: {envelope.get('encoding')}")
+        return cls.from_bytes(base64.b64decode(envelope["payload"]))
+
+    @classmethod
+    def coerce(cls, value, symbol: Optional[str] = None) -> "ColumnarFrame":
+        """Accept a frame, a wire envelope, a DataFrame or a list of per-bar dicts"""
+        if isinstance(value, cls):
+            return value
+        if value is None:
+            return cls(symbol)
+        if isinstance(value, dict) and "encoding" in value:
+            return cls.from_wire(value)
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return cls.from_bytes(value)
+        if isinstance(value, pd.DataFrame):
+            return cls.from_pandas(value, symbol)
+        return cls.from_records(list(value), symbol)
+
+
+class OHLCV(ColumnarFrame):
+    """Candles: timestamp, open, high, low, close, volume"""
+
+    FIELDS = ("timestamp", "open", "high", "low", "close", "volume")
+    KIND = 0
+
+
+class Ticks(ColumnarFrame):
+    """Ticks: timestamp, price, volume"""
+
+    FIELDS = ("timestamp", "price", "volume")
+    KIND = 1
@@ -0,0 +1,194 @@
+import asyncio
+import logging
+import multiprocessing
+import time
+from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from config import settings
+from metrics import Timing
+
+logger = logging.getLogger(__name__)
+
+# Where offloaded work runs
+THREAD = "thread"  # NumPy/pandas code that releases the GIL
+PROCESS = "process"  # pure-Python loops that would hold the GIL
+INLINE = "inline"  # on the calling thread (small inputs, or offloading disabled)
+
+EXECUTOR_KINDS = (THREAD, PROCESS, INLINE)
+
+
+class SharedArray(NamedTuple):
+    """Picklable handle to a NumPy array in a shared memory block"""
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+
+def share_array(array: np.ndarray) -> Tuple[SharedArray, shared_memory.SharedMemory]:
+    """Copy ``array`` into a new shared memory block; the caller unlinks the block"""
+    array = np.ascontiguousarray(array)
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    return SharedArray(block.name, array.shape, array.dtype.str), block
+
+
+def _attach(args: tuple, kwargs: dict) -> Tuple[tuple, dict, List[shared_memory.SharedMemory]]:
+    """Swap SharedArray handles for read-only array views (worker side)"""
+    blocks = []
+
+    def attach(value):
+        if not isinstance(value, SharedArray):
+            return value
+        block = shared_memory.SharedMemory(name=value.name)
+        blocks.append(block)
+        view = np.ndarray(value.shape, dtype=np.dtype(value.dtype), buffer=block.buf)
+        view.flags.writeable = False
+        return view
+
+    return tuple(attach(a) for a in args), {k: attach(v) for k, v in kwargs.items()}, blocks
+
+
+def _run_timed(fn: Callable, args: tuple, kwargs: dict) -> Tuple[Any, float, float]:
+    """Runs in the worker: the result plus start/end times on the system-wide monotonic clock"""
+    started = time.monotonic()
+    args, kwargs, blocks = _attach(args, kwargs)
+    try:
+        result = fn(*args, **kwargs)
+    finally:
+        del args, kwargs
+        for block in blocks:
+            block.close()
+    return result, started, time.monotonic()
+
+
+class ComputeExecutors:
+    """Thread and process pools for CPU-heavy agent analytics.
+
+    ``run(fn, *args, kind=...)`` awaits ``fn`` on a worker so the event loop
+    keeps serving requests. Use ``thread`` for NumPy/pandas code (it
+    releases the GIL) and ``process`` for pure-Python loops. For the
+    process pool, NumPy arrays of at least ``shm_min_bytes`` travel through
+    shared memory instead of being pickled. Inputs with fewer than
+    ``min_items`` elements run inline, where a hop to a pool would cost
+    more than the work. Queue wait (submit to start) and run time are
+    recorded per function.
+    """
+
+    def __init__(
+        self,
+        thread_workers: int = 4,
+        process_workers: int = 2,
+        min_items: int = 0,
+        shm_min_bytes: int = 64 * 1024,
+        start_method: str = "spawn",
+    ):
+        self.thread_workers = thread_workers
+        self.process_workers = process_workers
+        self.min_items = min_items
+        self.shm_min_bytes = shm_min_bytes
+        self.start_method = start_method
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self.queue_wait: Dict[str, Timing] = defaultdict(Timing)
+        self.run_time: Dict[str, Timing] = defaultdict(Timing)
+        self.metrics = {kind: {"submitted": 0, "in_flight": 0, "errors": 0} for kind in EXECUTOR_KINDS}
+        self.metrics[PROCESS]["shared_arrays"] = 0
+
+    def _pool(self, kind: str) -> Executor:
+        # Pools start on first use, so agents that never offload pay nothing
+        if kind == THREAD:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(self.thread_workers, thread_name_prefix="compute")
+            return self._threads
+        if self._processes is None:
+            self._processes = ProcessPoolExecutor(
+                self.process_workers, mp_context=multiprocessing.get_context(self.start_method)
+            )
+        return self._processes
+
+    def _resolve(self, kind: str, args: tuple) -> str:
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Unknown executor kind: {kind}")
+        if kind == PROCESS and self.process_workers <= 0:
+            kind = THREAD
+        if kind == THREAD and self.thread_workers <= 0:
+            kind = INLINE
+        if self.min_items and args and hasattr(args[0], "__len__") and len(args[0]) < self.min_items:
+            kind = INLINE
+        return kind
+
+    async def run(self, fn: Callable, *args, kind: str = THREAD, **kwargs) -> Any:
+        """``fn(*args, **kwargs)`` on the ``kind`` pool, without blocking the event loop"""
+        kind = self._resolve(kind, args)
+        name = f"{fn.__module__}.{fn.__qualname__}"
+        metrics = self.metrics[kind]
+        metrics["submitted"] += 1
+        metrics["in_flight"] += 1
+        blocks = []
+        submitted = time.monotonic()
+        try:
+            if kind == INLINE:
+                result, started, finished = _run_timed(fn, args, kwargs)
+            else:
+                if kind == PROCESS:
+                    args, kwargs, blocks = self._share(args, kwargs)
+                loop = asyncio.get_running_loop()
+                result, started, finished = await loop.run_in_executor(
+                    self._pool(kind), _run_timed, fn, args, kwargs
+                )
+            self.queue_wait[name].record((started - submitted) * 1000)
+            self.run_time[name].record((finished - started) * 1000)
+            return result
+        except Exception:
+            metrics["errors"] += 1
+            raise
+        finally:
+            metrics["in_flight"] -= 1
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    def _share(self, args: tuple, kwargs: dict) -> Tuple[tuple, dict, List[shared_memory.SharedMemory]]:
+        """Move large arrays into shared memory so only a small handle is pickled"""
+        blocks = []
+
+        def share(value):
+            if isinstance(value, np.ndarray) and value.nbytes >= self.shm_min_bytes:
+                handle, block = share_array(value)
+                blocks.append(block)
+                self.metrics[PROCESS]["shared_arrays"] += 1
+                return handle
+            return value
+
+        return tuple(share(a) for a in args), {k: share(v) for k, v in kwargs.items()}, blocks
+
+    def shutdown(self, wait: bool = True):
+        for pool in (self._threads, self._processes):
+            if pool is not None:
+                pool.shutdown(wait=wait, cancel_futures=True)
+        self._threads = self._processes = None
+
+    def stats(self) -> Dict:
+        return {
+            "thread_workers": self.thread_workers,
+            "process_workers": self.process_workers,
+            **self.metrics,
+            "functions": {
+                name: {"queue_wait": self.queue_wait[name].to_dict(), "run": self.run_time[name].to_dict()}
+                for name in self.run_time
+            },
+        }
+
+
+compute = ComputeExecutors(
+    thread_workers=settings.compute_thread_workers,
+    process_workers=settings.compute_process_workers,
+    min_items=settings.compute_offload_min_items,
+    shm_min_bytes=settings.compute_shm_min_bytes,
+    start_method=settings.compute_process_start_method,
+)
@@ -0,0 +1,195 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Safe to send twice; other methods (POST, PATCH) only retry failures where
+# the request never reached the server, unless retry_non_idempotent is set
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+NOT_PROCESSED_STATUS_CODES = {429}
+
+
+class AsyncHTTPClient:
+    """Shared async HTTP client for agent calls to LLM and search APIs.
+
+    Wraps a single ``httpx.AsyncClient`` so every agent reuses pooled
+    keep-alive (HTTP/2 when ``h2`` is installed) connections. Adds a
+    per-host concurrency limit, retries with jittered exponential backoff
+    and request/connection statistics. POSTs are not idempotent (an LLM
+    call retried after a read timeout is billed twice), so by default they
+    are only retried when the request was never sent or was rejected with
+    429.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        per_host_limit: int = 10,
+        timeout: float = 30.0,
+        connect_timeout: float = 5.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        http2: bool = True,
+        retry_non_idempotent: bool = False,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.per_host_limit = per_host_limit
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_non_idempotent = retry_non_idempotent
+        self.http2 = http2 and HTTP2_AVAILABLE
+        if http2 and not HTTP2_AVAILABLE:
+            logger.warning("h2 not installed, HTTP client falling back to HTTP/1.1")
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._host_stats: Dict[str, Dict[str, float]] = {}
+        self._connections_opened = 0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                limits=self.limits, timeout=self.timeout, http2=self.http2
+            )
+        return self._client
+
+    def _semaphore(self, host: str) -> asyncio.Semaphore:
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+            self._host_stats[host] = {
+                "requests": 0,
+                "retries": 0,
+                "failures": 0,
+                "in_flight": 0,
+                "total_ms": 0.0,
+            }
+        return self._host_semaphores[host]
+
+    async def _trace(self, event: str, info: Dict):
+        """httpx ``trace`` extension hook: counts new TCP connections"""
+        if event == "connection.connect_tcp.complete":
+            self._connections_opened += 1
+
+    def _retryable(self, method: str, error: Optional[Exception] = None, status_code: Optional[int] = None) -> bool:
+        if method.upper() in IDEMPOTENT_METHODS or self.retry_non_idempotent:
+            return True
+        if error is not None:
+            return isinstance(error, NOT_SENT_ERRORS)
+        return status_code in NOT_PROCESSED_STATUS_CODES
+
+    def _backoff(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """Full-jitter exponential backoff, honouring a numeric Retry-After"""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request, retrying transport errors and retryable status codes"""
+        host = urlsplit(url).netloc
+        semaphore = self._semaphore(host)
+        stats = self._host_stats[host]
+        kwargs["extensions"] = {"trace": self._trace, **kwargs.get("extensions", {})}
+
+        async with semaphore:
+            stats["in_flight"] += 1
+            start = time.perf_counter()
+            try:
+                for attempt in range(self.max_retries + 1):
+                    is_last = attempt == self.max_retries
+                    try:
+                        response = await self.client.request(method, url, **kwargs)
+                    except (httpx.TransportError, httpx.TimeoutException) as e:
+                        if is_last or not self._retryable(method, error=e):
+                            stats["failures"] += 1
+                            raise
+                        delay = self._backoff(attempt)
+                        logger.warning(f"{method} {host} failed ({e!r}), retrying in {delay:.2f}s")
+                    else:
+                        if (
+                            response.status_code not in RETRY_STATUS_CODES
+                            or is_last
+                            or not self._retryable(method, status_code=response.status_code)
+                        ):
+                            return response
+                        delay = self._backoff(attempt, response)
+                        logger.warning(f"{method} {host} returned {response.status_code}, retrying in {delay:.2f}s")
+                        await response.aclose()
+                    stats["retries"] += 1
+                    await asyncio.sleep(delay)
+            finally:
+                stats["requests"] += 1
+                stats["in_flight"] -= 1
+                stats["total_ms"] += (time.perf_counter() - start) * 1000
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    def stats(self) -> Dict:
+        """Connection and per-host request statistics"""
+        requests = sum(stats["requests"] for stats in self._host_stats.values())
+        return {
+            "http2": self.http2,
+            "retry_non_idempotent": self.retry_non_idempotent,
+            "pool": {
+                "max_connections": self.limits.max_connections,
+                "max_keepalive_connections": self.limits.max_keepalive_connections,
+                "in_flight": sum(stats["in_flight"] for stats in self._host_stats.values()),
+                "connections_opened": self._connections_opened,
+                "requests_per_connection": round(requests / self._connections_opened, 2)
+                if self._connections_opened else 0.0,
+            },
+            "hosts": {
+                host: {
+                    **{k: v for k, v in stats.items() if k != "total_ms"},
+                    "avg_ms": round(stats["total_ms"] / stats["requests"], 3) if stats["requests"] else 0.0,
+                }
+                for host, stats in self._host_stats.items()
+            },
+        }
+
+    async def aclose(self):
+        """Close pooled connections (call on shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Global HTTP client instance shared by all agents
+http_client = AsyncHTTPClient(
+    max_connections=settings.http_max_connections,
+    max_keepalive_connections=settings.http_max_keepalive_connections,
+    per_host_limit=settings.http_per_host_limit,
+    timeout=settings.http_timeout,
+    max_retries=settings.http_max_retries,
+    retry_non_idempotent=settings.http_retry_non_idempotent,
+)
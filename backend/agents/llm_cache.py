@@ -0,0 +1,175 @@
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+import redis.asyncio as aioredis
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+_TIMEFRAME_RE = re.compile(r"^(\d+)\s*([smhdw])$", re.IGNORECASE)
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def timeframe_seconds(timeframe: str) -> Optional[int]:
+    """Candle length in seconds for timeframes like "1m", "15m", "4h", "1d" """
+    match = _TIMEFRAME_RE.match(timeframe.strip()) if timeframe else None
+    if not match:
+        return None
+    return int(match.group(1)) * _UNIT_SECONDS[match.group(2).lower()]
+
+
+def candle_ttl(timeframe: Optional[str], now: Optional[float] = None, default: float = 300.0) -> float:
+    """Seconds until the current candle closes (epoch-aligned), or ``default``"""
+    period = timeframe_seconds(timeframe) if timeframe else None
+    if not period:
+        return default
+    now = time.time() if now is None else now
+    return period - (now % period)
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace so formatting-only differences share a cache entry"""
+    return " ".join(prompt.split())
+
+
+def prompt_key(model: str, temperature: float, messages: list) -> str:
+    """Cache key from model, temperature and a hash of the normalized messages"""
+    normalized = [
+        {"role": m.get("role"), "content": normalize_prompt(m.get("content", ""))}
+        for m in messages
+    ]
+    digest = hashlib.sha256(json.dumps(normalized, sort_keys=True).encode("utf-8")).hexdigest()
+    return f"{model}:{temperature}:{digest}"
+
+
+class LLMResponseCache:
+    """Two-tier (in-process LRU + optional Redis) cache for LLM responses.
+
+    Concurrent requests for the same key are coalesced so only one upstream
+    call is made; the others await its result. The call runs in its own
+    task, so it completes (and is cached) even if the caller that started
+    it is cancelled.
+    """
+
+    def __init__(self, max_entries: int = 1024, redis_url: Optional[str] = None, prefix: str = "llm_cache:"):
+        self.max_entries = max_entries
+        self.redis_url = redis_url
+        self.prefix = prefix
+        self.redis = None
+        self._lru: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.metrics = {
+            "memory_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "errors": 0,
+        }
+
+    def _get_memory(self, key: str) -> Optional[str]:
+        entry = self._lru.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.time():
+            del self._lru[key]
+            return None
+        self._lru.move_to_end(key)
+        return value
+
+    def _set_memory(self, key: str, value: str, ttl: float):
+        self._lru[key] = (time.time() + ttl, value)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    async def _get_redis(self, key: str) -> Optional[str]:
+        if not self.redis_url:
+            return None
+        try:
+            if self.redis is None:
+                self.redis = aioredis.Redis.from_url(self.redis_url)
+            value = await self.redis.get(self.prefix + key)
+            return value.decode("utf-8") if value is not None else None
+        except Exception as e:
+            logger.warning(f"LLM cache Redis read failed: {e}")
+            return None
+
+    async def _set_redis(self, key: str, value: str, ttl: float):
+        if not self.redis_url:
+            return
+        try:
+            if self.redis is None:
+                self.redis = aioredis.Redis.from_url(self.redis_url)
+            await self.redis.set(self.prefix + key, value, px=max(1, int(ttl * 1000)))
+        except Exception as e:
+            logger.warning(f"LLM cache Redis write failed: {e}")
+
+    def _compute(self, key: str, compute: Callable[[], Awaitable[str]], ttl: float) -> asyncio.Task:
+        """Start (or join) the lookup-and-compute task for ``key``"""
+        task = self._inflight.get(key)
+        if task is not None:
+            return task
+
+        async def run() -> str:
+            try:
+                value = await self._get_redis(key)
+                if value is not None:
+                    self.metrics["redis_hits"] += 1
+                    self._set_memory(key, value, ttl)
+                    return value
+                self.metrics["misses"] += 1
+                value = await compute()
+                self._set_memory(key, value, ttl)
+                await self._set_redis(key, value, ttl)
+                return value
+            except Exception:
+                self.metrics["errors"] += 1
+                raise
+            finally:
+                self._inflight.pop(key, None)
+
+        task = asyncio.create_task(run())
+        self._inflight[key] = task
+        return task
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[str]], ttl: float) -> str:
+        """Return the cached response for ``key`` or compute, cache and return it"""
+        value = self._get_memory(key)
+        if value is not None:
+            self.metrics["memory_hits"] += 1
+            return value
+
+        if key in self._inflight:
+            self.metrics["coalesced"] += 1
+        # Shielded: a cancelled caller does not cancel the call other callers share
+        return await asyncio.shield(self._compute(key, compute, ttl))
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and hit rate"""
+        hits = self.metrics["memory_hits"] + self.metrics["redis_hits"] + self.metrics["coalesced"]
+        lookups = hits + self.metrics["misses"]
+        return {
+            **self.metrics,
+            "entries": len(self._lru),
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+    async def close(self):
+        if self.redis:
+            await self.redis.close()
+            self.redis = None
+
+
+# Global LLM response cache instance
+llm_cache = LLMResponseCache(
+    max_entries=settings.llm_cache_max_entries,
+    redis_url=settings.llm_cache_redis_url,
+)
@@ -1,40 +1,12 @@
-from abc import ABC, abstractmethod
-from typing import Dict, Any
-import logging
-from datetime import datetime
+from typing import Dict
 
-logger = logging.getLogger(__name__)
+from agents.base import AgentModel
 
-class BaseModel(ABC):
-    """Base class for AI model integration"""
-
-    def __init__(self, model_name: str = "macroforecaster_model"):
-        self.model_name = model_name
-        self.initialized = False
-
-    @abstractmethod
-    async def predict(self, input_data: Dict) -> Dict:
-        """Make prediction using the AI model"""
-        pass
-
-    @abstractmethod
-    def load_model(self):
-        """Load the AI model"""
-        pass
-
-class MacroforecasterModel(BaseModel):
+class MacroforecasterModel(AgentModel):
     """AI model for macroforecaster agent"""
 
     def __init__(self):
         super().__init__("macroforecaster_model")
-        self.load_model()
-
-    def load_model(self):
-        """Load the specific AI model for this agent"""
-        # TODO: Integrate with actual AI model (Mistral, Kimi, etc.)
-        logger.info(f"Loading {self.model_name} model...")
-        self.initialized = True
-        logger.info(f"{self.model_name} model loaded successfully")
 
     async def predict(self, input_data: Dict) -> Dict:
         """Make prediction using the loaded model"""
@@ -43,17 +15,14 @@ class MacroforecasterModel(BaseModel):
 
         # TODO: Replace with actual model inference
         # This is a placeholder implementation
-
-        
-prediction = {
-    "news_impact": "positive",
-    "economic_bias": "bullish",
-    "impact_score": 0.7,
-    "key_events": ["Fed meeting", "Employment data"],
-    "confidence": 0.68,
-    "reasoning": "Positive economic indicators suggest bullish bias"
-}
-
+        prediction = {
+            "news_impact": "positive",
+            "economic_bias": "bullish",
+            "impact_score": 0.7,
+            "key_events": ["Fed meeting", "Employment data"],
+            "confidence": 0.68,
+            "reasoning": "Positive economic indicators suggest bullish bias"
+        }
 
         return prediction
 
@@ -1,97 +1,267 @@
 import numpy as np
-import pandas as pd
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+import heapq
 import logging
+import math
+from collections import OrderedDict, deque
+
+from agents.base import AgentUtils
+from agents.columnar import Ticks
+from agents.executors import THREAD, compute
+from agents.streaming_indicators import RollingVariance, restore_indicator
 
 logger = logging.getLogger(__name__)
 
-class MarketsentinelUtils:
+class MarketsentinelUtils(AgentUtils):
     """Utility functions for marketsentinel agent"""
 
-    @staticmethod
-    def validate_input(data: Dict) -> bool:
-        """Validate input data format"""
-        required_fields = ["symbol", "timeframe"]
-        return all(field in data for field in required_fields)
-
-    @staticmethod
-    def calculate_confidence(factors: Dict) -> float:
-        """Calculate confidence score based on multiple factors"""
-        if not factors:
-            return 0.0
-
-        # Simple weighted average - customize per agent
-        weights = {
-            "strength": 0.4,
-            "volume": 0.3,
-            "trend": 0.2,
-            "volatility": 0.1
-        }
-
-        score = 0.0
-        total_weight = 0.0
-
-        for factor, value in factors.items():
-            if factor in weights:
-                score += weights[factor] * value
-                total_weight += weights[factor]
-
-        return min(max(score / total_weight if total_weight > 0 else 0.0, 0.0), 1.0)
-
-    @staticmethod
-    def format_output(analysis: Dict) -> Dict:
-        """Format analysis output for consistency"""
-        return {
-            "analysis": analysis,
-            "timestamp": pd.Timestamp.now().isoformat(),
-            "version": "1.0"
-        }
-
 # Agent-specific utility functions
 
+def classify_volatility_regime(volatility: float) -> str:
+    """Classify annualized volatility into a regime"""
+    if volatility > 0.3:
+        return "high"
+    elif volatility > 0.15:
+        return "medium"
+    return "low"
+
 def analyze_volatility(price_data: List[float], window: int = 20) -> Dict:
-    """Analyze market volatility"""
+    """Analyze market volatility; prices must be finite and positive"""
     if len(price_data) < window:
         return {"volatility": 0, "regime": "unknown"}
     
-    import numpy as np
-    returns = np.diff(np.log(price_data))
+    prices = np.asarray(price_data, dtype=np.float64)
+    if not (np.isfinite(prices) & (prices > 0)).all():
+        raise ValueError("Prices must be finite and positive to compute volatility")
+    returns = np.diff(np.log(prices))
     volatility = np.std(returns) * np.sqrt(252)  # Annualized
     
-    # Classify volatility regime
-    if volatility > 0.3:
-        regime = "high"
-    elif volatility > 0.15:
-        regime = "medium"
-    else:
-        regime = "low"
-    
     return {
         "volatility": round(volatility, 4),
-        "regime": regime,
+        "regime": classify_volatility_regime(volatility),
         "returns_std": np.std(returns),
         "avg_return": np.mean(returns)
     }
 
-def detect_scalping_opportunities(tick_data: List[Dict]) -> List[Dict]:
-    """Detect short-term scalping opportunities"""
-    opportunities = []
-    
-    if len(tick_data) < 100:
-        return opportunities
-    
-    # Simple momentum-based opportunities (placeholder)
-    for i in range(10, len(tick_data) - 10):
-        current_price = float(tick_data[i].get("price", 0))
-        prev_prices = [float(tick_data[j].get("price", 0)) for j in range(i-10, i)]
-        
-        if current_price > max(prev_prices) * 1.001:  # 0.1% breakout
-            opportunities.append({
-                "type": "bullish_momentum",
-                "price": current_price,
-                "timestamp": tick_data[i].get("timestamp"),
-                "strength": min((current_price / max(prev_prices) - 1) * 1000, 10)
-            })
-    
-    return opportunities[:5]  # Return top 5
+async def analyze_volatility_async(price_data, window: int = 20) -> Dict:
+    """``analyze_volatility`` on the compute thread pool (NumPy releases the GIL)"""
+    prices = np.asarray(price_data, dtype=np.float64)
+    return await compute.run(analyze_volatility, prices, window, kind=THREAD)
+
+class StreamingVolatility:
+    """Annualized volatility of log returns over a rolling window, O(1) per price"""
+
+    def __init__(self, window: int = 20, periods_per_year: int = 252):
+        self.window = window
+        self.periods_per_year = periods_per_year
+        self.prev_price = None
+        self.variance = RollingVariance(window)
+
+    def update(self, price: float) -> Dict:
+        if self.prev_price is not None and self.prev_price > 0 and price > 0:
+            self.variance.update(math.log(price / self.prev_price))
+        self.prev_price = price
+        return self.value
+
+    @property
+    def value(self) -> Dict:
+        std = self.variance.std
+        if std is None:
+            return {"volatility": 0, "regime": "unknown"}
+        volatility = std * math.sqrt(self.periods_per_year)
+        return {
+            "volatility": round(volatility, 4),
+            "regime": classify_volatility_regime(volatility),
+            "returns_std": std,
+            "avg_return": self.variance.mean,
+        }
+
+    def snapshot(self) -> Dict:
+        return {
+            "window": self.window,
+            "periods_per_year": self.periods_per_year,
+            "prev_price": self.prev_price,
+            "variance": self.variance.snapshot(),
+        }
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Dict) -> "StreamingVolatility":
+        tracker = cls(snapshot["window"], snapshot["periods_per_year"])
+        tracker.prev_price = snapshot["prev_price"]
+        tracker.variance = restore_indicator(snapshot["variance"])
+        return tracker
+
+class LiveVolatility:
+    """``StreamingVolatility`` per (symbol, timeframe) for live tick feeds.
+
+    Each call feeds only the ticks newer than the last one seen (ticks are
+    final, so none is held back), which costs O(new ticks) instead of a pass
+    over the whole history. The tracker is rebuilt from the last
+    ``window + 1`` prices on first sight, when the ticks no longer overlap
+    what was seen, or when they carry no timestamps. The least recently used
+    symbols are dropped beyond ``max_symbols``.
+    """
+
+    def __init__(self, max_symbols: int = 10000, window: int = 20):
+        self.max_symbols = max_symbols
+        self.window = window
+        self._symbols: "OrderedDict[Tuple[str, str], Tuple[int, StreamingVolatility]]" = OrderedDict()
+        self.metrics = {"rebuilds": 0, "incremental": 0, "ticks_fed": 0}
+
+    def update(self, symbol: str, timeframe: str, ticks: Ticks) -> Dict:
+        """Volatility after the ticks in ``ticks``"""
+        key = (symbol, timeframe)
+        timestamps = ticks.timestamp
+        # Missing timestamps are zeros: nothing to track the feed position by
+        tracked = len(ticks) > 0 and timestamps[-1] > 0
+        entry = self._symbols.get(key) if tracked else None
+        if entry is not None and timestamps[0] <= entry[0] <= timestamps[-1]:
+            last_seen, tracker = entry
+            prices = ticks.price[timestamps > last_seen]
+            self.metrics["incremental"] += 1
+        else:
+            tracker = StreamingVolatility(self.window)
+            prices = ticks.price[-(self.window + 1):]
+            self.metrics["rebuilds"] += 1
+
+        prices = prices[np.isfinite(prices)]
+        for price in prices.tolist():
+            tracker.update(price)
+        self.metrics["ticks_fed"] += len(prices)
+
+        if tracked:
+            self._symbols[key] = (int(timestamps[-1]), tracker)
+            self._symbols.move_to_end(key)
+            while len(self._symbols) > self.max_symbols:
+                self._symbols.popitem(last=False)
+        return tracker.value
+
+    def stats(self) -> Dict:
+        return {**self.metrics, "symbols": len(self._symbols)}
+
+def warm_volatility(prices, window: int = 20, periods_per_year: int = 252) -> Dict:
+    """Snapshot of a ``StreamingVolatility`` fed a whole price history"""
+    tracker = StreamingVolatility(window, periods_per_year)
+    for price in prices:
+        tracker.update(float(price))
+    return tracker.snapshot()
+
+def sliding_window_max(values: np.ndarray, window: int) -> np.ndarray:
+    """Max of every length-``window`` slice, O(n) (van Herk/Gil-Werman).
+
+    ``result[i] == values[i:i + window].max()`` for ``i`` in
+    ``range(len(values) - window + 1)``.
+    """
+    n = len(values)
+    if n < window:
+        return np.empty(0, dtype=values.dtype)
+    blocks = -(-n // window)
+    padded = np.full(blocks * window, -np.inf)
+    padded[:n] = values
+    padded = padded.reshape(blocks, window)
+    prefix = np.maximum.accumulate(padded, axis=1).ravel()
+    suffix = np.maximum.accumulate(padded[:, ::-1], axis=1)[:, ::-1].ravel()
+    starts = np.arange(n - window + 1)
+    return np.maximum(suffix[starts], prefix[starts + window - 1])
+
+def find_breakouts(prices: np.ndarray, window: int = 10, threshold: float = 0.001, top_k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+    """Indices and strengths of the ``top_k`` strongest breakouts, strongest first.
+
+    A breakout at ``i`` is a price more than ``threshold`` above the max of
+    the previous ``window`` prices. Strength is the excess in tenths of a
+    percent, capped at 10.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    if len(prices) <= window:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+
+    prev_max = sliding_window_max(prices[:-1], window)  # prev_max[j] covers prices[j:j + window]
+    current = prices[window:]
+    hits = np.flatnonzero(current > prev_max * (1 + threshold))
+    if len(hits) == 0:
+        return hits, np.empty(0)
+
+    strengths = np.minimum((current[hits] / prev_max[hits] - 1) * 1000, 10)
+    if len(hits) > top_k:
+        best = np.argpartition(-strengths, top_k - 1)[:top_k]
+        hits, strengths = hits[best], strengths[best]
+    order = np.lexsort((hits, -strengths))  # strongest first, earliest on ties
+    return hits[order] + window, strengths[order]
+
+def detect_scalping_opportunities(tick_data, window: int = 10, threshold: float = 0.001, top_k: int = 5) -> List[Dict]:
+    """Detect the ``top_k`` strongest short-term breakout opportunities.
+
+    ``tick_data`` may be per-tick dicts or a ``Ticks`` frame / wire envelope
+    (whose timestamps are epoch milliseconds).
+    """
+    if isinstance(tick_data, list):
+        prices = np.fromiter(
+            (float(t.get("price", 0)) for t in tick_data), dtype=np.float64, count=len(tick_data)
+        )
+        timestamps = [t.get("timestamp") for t in tick_data]
+    else:
+        # Coerce first: a wire envelope is a two-key dict, not len(ticks)
+        ticks = Ticks.coerce(tick_data)
+        prices = ticks.price
+        timestamps = ticks.timestamp.tolist()
+
+    if len(prices) < 100:
+        return []
+
+    indices, strengths = find_breakouts(prices, window, threshold, top_k)
+    return [
+        {
+            "type": "bullish_momentum",
+            "price": float(prices[i]),
+            "timestamp": timestamps[i],
+            "strength": float(strength),
+        }
+        for i, strength in zip(indices, strengths)
+    ]
+
+class BreakoutDetector:
+    """Streaming breakout detector: O(1) amortized per tick via a monotonic deque.
+
+    Keeps the ``top_k`` strongest breakouts seen so far in a min-heap.
+    """
+
+    def __init__(self, window: int = 10, threshold: float = 0.001, top_k: int = 5):
+        self.window = window
+        self.threshold = threshold
+        self.top_k = top_k
+        self.count = 0
+        self._maxq = deque()  # (index, price), prices strictly decreasing
+        self._heap = []  # (strength, -index, opportunity)
+
+    def update(self, price: float, timestamp=None) -> Optional[Dict]:
+        """Feed one tick; returns the opportunity if this tick is a breakout"""
+        index = self.count
+        self.count += 1
+        # Drop the tick that just left the window of previous prices
+        while self._maxq and self._maxq[0][0] < index - self.window:
+            self._maxq.popleft()
+
+        opportunity = None
+        if index >= self.window:
+            prev_max = self._maxq[0][1]
+            if price > prev_max * (1 + self.threshold):
+                opportunity = {
+                    "type": "bullish_momentum",
+                    "price": price,
+                    "timestamp": timestamp,
+                    "strength": min((price / prev_max - 1) * 1000, 10),
+                }
+                entry = (opportunity["strength"], -index, opportunity)
+                if len(self._heap) < self.top_k:
+                    heapq.heappush(self._heap, entry)
+                elif entry[:2] > self._heap[0][:2]:
+                    heapq.heapreplace(self._heap, entry)
+
+        while self._maxq and self._maxq[-1][1] <= price:
+            self._maxq.pop()
+        self._maxq.append((index, price))
+        return opportunity
 
+    def top(self) -> List[Dict]:
+        """Strongest breakouts so far, strongest first"""
+        return [entry[2] for entry in sorted(self._heap, key=lambda e: e[:2], reverse=True)]
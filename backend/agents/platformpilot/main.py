@@ -1,94 +1,23 @@
-from fastapi import FastAPI, HTTPException, Depends
-from pydantic import BaseModel
-from typing import Dict, List, Optional
-import uvicorn
-import asyncio
-import httpx
 import logging
-from datetime import datetime
-import json
+
+from agents.runtime import AgentService
+from config import settings
+from .model import model
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
 
-app = FastAPI(
-    title="Platformpilot Agent",
+service = AgentService(
+    name="platformpilot",
     description="Platform automation and trade logging",
-    version="1.0.0"
+    model=model,
+    port=settings.platformpilot_port,
+    agent_type="platform_automation",
+    default_reasoning="Platform automation execution",
+    data_fields={"trade_decision": {}, "automation_type": "logging"},
 )
-
-class AgentInput(BaseModel):
-    symbol: str
-    timeframe: str
-    data: Dict
-    context: Optional[Dict] = None
-
-class AgentOutput(BaseModel):
-    agent_name: str = "platformpilot"
-    timestamp: datetime
-    symbol: str
-    confidence: float
-    signal_type: Optional[str] = None
-    reasoning: str
-    data: Dict
-    metadata: Optional[Dict] = None
-
-# Agent-specific logic based on type
-
-async def process_signal(input_data: AgentInput) -> AgentOutput:
-    """Process platform automation"""
-    from .model import model
-    from .utils import PlatformpilotUtils
-    
-    # Get trade decision data
-    trade_decision = input_data.data.get("trade_decision", {})
-    
-    # Process automation request
-    analysis = await model.predict({
-        "trade_decision": trade_decision,
-        "symbol": input_data.symbol,
-        "automation_type": input_data.data.get("automation_type", "logging")
-    })
-    
-    return AgentOutput(
-        timestamp=datetime.now(),
-        symbol=input_data.symbol,
-        confidence=1.0,  # Platform actions are deterministic
-        reasoning=analysis.get("reasoning", "Platform automation execution"),
-        data=analysis,
-        metadata={"agent_type": "platform_automation"}
-    )
-
-
-@app.get("/health")
-async def health_check():
-    return {"status": "healthy", "agent": "platformpilot", "timestamp": datetime.now()}
-
-@app.post("/analyze", response_model=AgentOutput)
-async def analyze(input_data: AgentInput):
-    try:
-        logger.info(f"Received analysis request for {input_data.symbol}")
-
-        # Process the input data
-        result = await process_signal(input_data)
-
-        # Publish result to event bus (if available)
-        await publish_result(result)
-
-        return result
-
-    except Exception as e:
-        logger.error(f"Analysis failed: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-async def publish_result(result: AgentOutput):
-    """Publish result to Redis event bus"""
-    try:
-        # This would connect to Redis in production
-        logger.info(f"Publishing result for {result.symbol}")
-    except Exception as e:
-        logger.warning(f"Failed to publish result: {e}")
+app = service.app
+process_signal = service.process_signal
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8006)
+    service.run()
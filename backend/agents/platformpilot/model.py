@@ -1,40 +1,13 @@
-from abc import ABC, abstractmethod
-from typing import Dict, Any
-import logging
+from typing import Dict
 from datetime import datetime
 
-logger = logging.getLogger(__name__)
+from agents.base import AgentModel
 
-class BaseModel(ABC):
-    """Base class for AI model integration"""
-
-    def __init__(self, model_name: str = "platformpilot_model"):
-        self.model_name = model_name
-        self.initialized = False
-
-    @abstractmethod
-    async def predict(self, input_data: Dict) -> Dict:
-        """Make prediction using the AI model"""
-        pass
-
-    @abstractmethod
-    def load_model(self):
-        """Load the AI model"""
-        pass
-
-class PlatformpilotModel(BaseModel):
+class PlatformpilotModel(AgentModel):
     """AI model for platformpilot agent"""
 
     def __init__(self):
         super().__init__("platformpilot_model")
-        self.load_model()
-
-    def load_model(self):
-        """Load the specific AI model for this agent"""
-        # TODO: Integrate with actual AI model (Mistral, Kimi, etc.)
-        logger.info(f"Loading {self.model_name} model...")
-        self.initialized = True
-        logger.info(f"{self.model_name} model loaded successfully")
 
     async def predict(self, input_data: Dict) -> Dict:
         """Make prediction using the loaded model"""
@@ -43,16 +16,13 @@ class PlatformpilotModel(BaseModel):
 
         # TODO: Replace with actual model inference
         # This is a placeholder implementation
-
-        
-prediction = {
-    "automation_status": "executed",
-    "platform_actions": ["log_signal", "send_alert", "update_dashboard"],
-    "execution_time": datetime.now().isoformat(),
-    "confidence": 1.0,
-    "reasoning": "Platform automation completed successfully"
-}
-
+        prediction = {
+            "automation_status": "executed",
+            "platform_actions": ["log_signal", "send_alert", "update_dashboard"],
+            "execution_time": datetime.now().isoformat(),
+            "confidence": 1.0,  # Platform actions are deterministic
+            "reasoning": "Platform automation completed successfully"
+        }
 
         return prediction
 
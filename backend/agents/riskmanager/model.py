@@ -1,40 +1,24 @@
-from abc import ABC, abstractmethod
-from typing import Dict, Any
-import logging
-from datetime import datetime
+import math
+from typing import Dict, List, Union
 
-logger = logging.getLogger(__name__)
+import numpy as np
 
-class BaseModel(ABC):
-    """Base class for AI model integration"""
+from agents.base import AgentModel
 
-    def __init__(self, model_name: str = "riskmanager_model"):
-        self.model_name = model_name
-        self.initialized = False
+RISK_PERCENT = 2.0  # 2% risk per trade
 
-    @abstractmethod
-    async def predict(self, input_data: Dict) -> Dict:
-        """Make prediction using the AI model"""
-        pass
-
-    @abstractmethod
-    def load_model(self):
-        """Load the AI model"""
-        pass
+def portfolio_float(value) -> float:
+    """Portfolio value as a float; NaN and infinity are rejected like non-numbers"""
+    number = float(value)
+    if not math.isfinite(number):
+        raise ValueError(f"Portfolio value must be finite, got {value!r}")
+    return number
 
-class RiskmanagerModel(BaseModel):
+class RiskmanagerModel(AgentModel):
     """AI model for riskmanager agent"""
 
     def __init__(self):
         super().__init__("riskmanager_model")
-        self.load_model()
-
-    def load_model(self):
-        """Load the specific AI model for this agent"""
-        # TODO: Integrate with actual AI model (Mistral, Kimi, etc.)
-        logger.info(f"Loading {self.model_name} model...")
-        self.initialized = True
-        logger.info(f"{self.model_name} model loaded successfully")
 
     async def predict(self, input_data: Dict) -> Dict:
         """Make prediction using the loaded model"""
@@ -43,22 +27,42 @@ class RiskmanagerModel(BaseModel):
 
         # TODO: Replace with actual model inference
         # This is a placeholder implementation
+        portfolio_value = input_data.get("portfolio", {}).get("total_value", 10000)
+        # Validated like predict_batch, so both accept and reject the same values
+        return self._prediction(portfolio_value, portfolio_float(portfolio_value) * RISK_PERCENT / 100)
 
-        
-portfolio_value = input_data.get("portfolio", {}).get("total_value", 10000)
-risk_percent = 2.0  # 2% risk per trade
+    async def predict_batch(self, inputs: List[Dict]) -> List[Union[Dict, Exception]]:
+        """Vectorized ``predict``: position sizes for the whole batch in one array operation"""
+        if not self.initialized:
+            raise RuntimeError("Model not initialized")
 
-prediction = {
-    "position_size": portfolio_value * 0.02,
-    "stop_loss_percent": 1.0,
-    "take_profit_percent": 2.0,
-    "risk_reward_ratio": 2.0,
-    "confidence": 0.85,
-    "reasoning": f"Calculated 2% risk on portfolio of ${portfolio_value}"
-}
+        results: List[Union[Dict, Exception, None]] = [None] * len(inputs)
+        values = []
+        for i, item in enumerate(inputs):
+            value = 0.0
+            try:
+                value = item.get("portfolio", {}).get("total_value", 10000)
+                portfolio_float(value)
+            except Exception as e:
+                results[i], value = e, 0.0
+            values.append(value)
 
+        sizes = np.asarray(values, dtype=np.float64) * RISK_PERCENT / 100
+        return [
+            result if result is not None else self._prediction(value, float(size))
+            for result, value, size in zip(results, values, sizes)
+        ]
 
-        return prediction
+    @staticmethod
+    def _prediction(portfolio_value, position_size) -> Dict:
+        return {
+            "position_size": position_size,
+            "stop_loss_percent": 1.0,
+            "take_profit_percent": 2.0,
+            "risk_reward_ratio": 2.0,
+            "confidence": 0.85,
+            "reasoning": f"Calculated 2% risk on portfolio of ${portfolio_value}"
+        }
 
 # Global model instance
 model = RiskmanagerModel()
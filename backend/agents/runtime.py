@@ -0,0 +1,261 @@
+import asyncio
+import json
+import logging
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Union
+
+import uvicorn
+from fastapi import FastAPI, HTTPException
+from pydantic import ValidationError
+
+from agents.base import AgentBatchInput, AgentBatchOutput, AgentBatchResult, AgentInput, AgentModel, AgentOutput
+from agents.executors import compute
+from agents.http_client import http_client
+from config import settings
+from orchestrator.event_bus import event_bus
+from metrics import Timing
+
+logger = logging.getLogger(__name__)
+
+
+def validation_message(error: ValidationError) -> str:
+    """One-line summary of a pydantic error, e.g. ``timeframe: Field required``"""
+    return "; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in error.errors())
+
+
+class AgentService:
+    """The FastAPI service every agent runs on.
+
+    An agent supplies its model (``predict``) and the ``data`` fields the
+    model reads; the service provides the rest: ``/health``, ``/analyze``,
+    ``/analyze_batch`` and ``/metrics`` routes, the shared pooled HTTP
+    client, request and predict timings, publishing each result to
+    ``<name>_out`` on the event bus (micro-batched, off the request path)
+    and a shutdown that waits for pending publishes before closing the
+    bus, HTTP client and compute pools.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        model: AgentModel,
+        port: int,
+        agent_type: str,
+        default_reasoning: str,
+        data_fields: Optional[Dict[str, Any]] = None,
+        publish_results: bool = settings.agent_publish_results,
+        shutdown_timeout: float = settings.agent_shutdown_timeout,
+        batch_max_items: int = settings.agent_batch_max_items,
+    ):
+        self.name = name
+        self.description = description
+        self.model = model
+        self.port = port
+        self.agent_type = agent_type
+        self.default_reasoning = default_reasoning
+        # Model input field -> default when the request's data lacks it
+        self.data_fields = data_fields or {}
+        self.publish_results = publish_results
+        self.shutdown_timeout = shutdown_timeout
+        self.batch_max_items = batch_max_items
+        self.channel = f"{name}_out"
+        self.analyze_timing = Timing()
+        self.predict_timing = Timing()
+        self.batch_timing = Timing()
+        self.metrics = {
+            "requests": 0, "errors": 0, "in_flight": 0,
+            "batches": 0, "batch_items": 0, "batch_errors": 0,
+            "published": 0, "publish_errors": 0,
+        }
+        self._publishes: Set[asyncio.Task] = set()
+        self.app = self._build_app()
+
+    def model_input(self, input_data: AgentInput) -> Dict:
+        """What ``predict`` sees: the agent's data fields plus symbol, timeframe and context"""
+        payload = {field: input_data.data.get(field, default) for field, default in self.data_fields.items()}
+        payload.update(symbol=input_data.symbol, timeframe=input_data.timeframe, context=input_data.context)
+        return payload
+
+    def to_output(self, input_data: AgentInput, analysis: Dict) -> AgentOutput:
+        output = AgentOutput(
+            agent_name=self.name,
+            timestamp=datetime.now(),
+            symbol=input_data.symbol,
+            confidence=analysis.get("confidence", 0.0),
+            signal_type=analysis.get("signal_type"),
+            reasoning=analysis.get("reasoning", self.default_reasoning),
+            data=analysis,
+            metadata={"agent_type": self.agent_type}
+        )
+        # Fail this input now rather than the whole response while it is encoded
+        try:
+            json.dumps(output.model_dump(mode="json"), allow_nan=False)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"{self.name} output is not valid JSON: {e}") from e
+        return output
+
+    async def process_signal(self, input_data: AgentInput) -> AgentOutput:
+        """Run the model on one input"""
+        start = time.perf_counter()
+        analysis = await self.model.predict(self.model_input(input_data))
+        self.predict_timing.record((time.perf_counter() - start) * 1000)
+        return self.to_output(input_data, analysis)
+
+    async def analyze(self, input_data: AgentInput) -> AgentOutput:
+        self.metrics["requests"] += 1
+        self.metrics["in_flight"] += 1
+        start = time.perf_counter()
+        try:
+            logger.info(f"Received analysis request for {input_data.symbol}")
+            result = await self.process_signal(input_data)
+            self.publish(result)
+            return result
+        except Exception as e:
+            self.metrics["errors"] += 1
+            logger.error(f"Analysis failed: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+        finally:
+            self.metrics["in_flight"] -= 1
+            self.analyze_timing.record((time.perf_counter() - start) * 1000)
+
+    async def process_batch(self, inputs: List[AgentInput]) -> List[Union[AgentOutput, Exception]]:
+        """Run the model once over a batch; results are in input order, failures as exceptions"""
+        analyses = await self.model.predict_batch([self.model_input(item) for item in inputs])
+        results = []
+        for input_data, analysis in zip(inputs, analyses):
+            if isinstance(analysis, Exception):
+                results.append(analysis)
+                continue
+            try:
+                results.append(self.to_output(input_data, analysis))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    async def analyze_batch(self, batch: AgentBatchInput) -> AgentBatchOutput:
+        if len(batch.items) > self.batch_max_items:
+            raise HTTPException(status_code=400, detail=f"Batch too large (max {self.batch_max_items} items)")
+        self.metrics["batches"] += 1
+        self.metrics["batch_items"] += len(batch.items)
+        self.metrics["in_flight"] += 1
+        start = time.perf_counter()
+        try:
+            logger.info(f"Received batch analysis request for {len(batch.items)} items")
+            results: List[Optional[AgentBatchResult]] = [None] * len(batch.items)
+            valid = []
+            for index, item in enumerate(batch.items):
+                try:
+                    valid.append((index, AgentInput.model_validate(item)))
+                except ValidationError as e:
+                    results[index] = AgentBatchResult(index=index, error=f"Invalid input: {validation_message(e)}")
+            try:
+                outputs = await self.process_batch([input_data for _, input_data in valid]) if valid else []
+            except Exception as e:
+                # The whole batch failed (e.g. model not initialized): report it on every item
+                logger.error(f"Batch analysis failed: {e}")
+                outputs = [e] * len(valid)
+            for (index, _), output in zip(valid, outputs):
+                if isinstance(output, Exception):
+                    results[index] = AgentBatchResult(index=index, error=str(output) or repr(output))
+                else:
+                    results[index] = AgentBatchResult(index=index, result=output)
+                    self.publish(output)
+            errors = sum(result.error is not None for result in results)
+            if errors:
+                self.metrics["batch_errors"] += errors
+                logger.warning(f"{errors} of {len(results)} batch items failed")
+            return AgentBatchOutput(results=results)
+        finally:
+            self.metrics["in_flight"] -= 1
+            self.batch_timing.record((time.perf_counter() - start) * 1000)
+
+    def publish(self, result: AgentOutput):
+        """Publish a result to the event bus without holding up the response"""
+        if not self.publish_results:
+            return
+        task = asyncio.create_task(self._publish(result))
+        self._publishes.add(task)
+        task.add_done_callback(self._publishes.discard)
+
+    async def _publish(self, result: AgentOutput):
+        try:
+            await event_bus.publish(self.channel, result.model_dump())
+            self.metrics["published"] += 1
+        except Exception as e:
+            self.metrics["publish_errors"] += 1
+            logger.warning(f"Failed to publish result: {e}")
+
+    async def drain_publishes(self):
+        """Wait up to ``shutdown_timeout`` for pending publishes, cancelling the rest"""
+        if self._publishes:
+            _, pending = await asyncio.wait(set(self._publishes), timeout=self.shutdown_timeout)
+            if pending:
+                logger.warning(f"Dropping {len(pending)} unpublished {self.name} results on shutdown")
+                for task in pending:
+                    task.cancel()
+
+    async def shutdown(self):
+        """Wait for pending publishes, then close the event bus and HTTP client"""
+        await self.drain_publishes()
+        try:
+            if event_bus.redis:
+                await event_bus.disconnect()
+        except Exception as e:
+            logger.warning(f"Failed to disconnect from the event bus: {e}")
+        await http_client.aclose()
+        await asyncio.to_thread(compute.shutdown)
+        logger.info(f"🛑 {self.name} agent shut down")
+
+    def stats(self) -> Dict:
+        return {
+            "agent": self.name,
+            **self.metrics,
+            "pending_publishes": len(self._publishes),
+            "analyze": self.analyze_timing.to_dict(),
+            "predict": self.predict_timing.to_dict(),
+            "batch": self.batch_timing.to_dict(),
+            "http": http_client.stats(),
+            "executors": compute.stats(),
+        }
+
+    def _build_app(self) -> FastAPI:
+        @asynccontextmanager
+        async def lifespan(app: FastAPI):
+            yield
+            await self.shutdown()
+
+        app = FastAPI(
+            title=f"{self.name.capitalize()} Agent",
+            description=self.description,
+            version="1.0.0",
+            lifespan=lifespan,
+        )
+
+        @app.get("/health")
+        async def health_check():
+            return {"status": "healthy", "agent": self.name, "timestamp": datetime.now()}
+
+        @app.get("/metrics")
+        async def metrics():
+            return self.stats()
+
+        @app.get("/metrics/http")
+        async def http_metrics():
+            return http_client.stats()
+
+        @app.post("/analyze", response_model=AgentOutput)
+        async def analyze(input_data: AgentInput):
+            return await self.analyze(input_data)
+
+        @app.post("/analyze_batch", response_model=AgentBatchOutput)
+        async def analyze_batch(batch: AgentBatchInput):
+            """Analyze many inputs in one request; results come back in order with per-item errors"""
+            return await self.analyze_batch(batch)
+
+        return app
+
+    def run(self):
+        uvicorn.run(self.app, host="0.0.0.0", port=self.port)
@@ -0,0 +1,223 @@
+"""Incremental indicators updated in O(1) per new candle or tick.
+
+Each indicator keeps only the state it needs. ``update(value)`` returns the
+current reading, or None until enough values have been seen. ``snapshot()``
+returns a JSON-serializable dict and ``restore_indicator(snapshot)``
+rebuilds the indicator from it, for example after a restart or when moving
+a symbol to another worker. EMA and RSI use the same TA-Lib seeding as
+``agents/chartanalyst/indicators.py``, so streaming and batch readings agree.
+"""
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Dict, Optional
+
+
+class StreamingIndicator(ABC):
+    """Base class: O(1) ``update`` plus snapshot/restore"""
+
+    # Attributes holding deques, serialized as lists
+    _deque_fields = ()
+
+    @abstractmethod
+    def update(self, value: float) -> Optional[float]:
+        pass
+
+    @property
+    @abstractmethod
+    def value(self) -> Optional[float]:
+        pass
+
+    @property
+    def ready(self) -> bool:
+        return self.value is not None
+
+    def snapshot(self) -> Dict:
+        state = {
+            key: list(val) if key in self._deque_fields else val
+            for key, val in self.__dict__.items()
+        }
+        return {"type": type(self).__name__, "state": state}
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Dict) -> "StreamingIndicator":
+        indicator = cls.__new__(cls)
+        for key, val in snapshot["state"].items():
+            if key in cls._deque_fields:
+                val = deque(val, maxlen=snapshot["state"].get("window"))
+            setattr(indicator, key, val)
+        return indicator
+
+
+class RollingMean(StreamingIndicator):
+    """Mean of the last ``window`` values"""
+
+    _deque_fields = ("values",)
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.total = 0.0
+        self.updates = 0
+
+    def update(self, value: float) -> Optional[float]:
+        if len(self.values) == self.window:
+            self.total -= self.values[0]
+        self.values.append(value)
+        self.total += value
+        self.updates += 1
+        if self.updates % self.window == 0:
+            # Re-sum once per window (amortized O(1)) so rounding error
+            # from the running add/subtract does not accumulate
+            self.total = math.fsum(self.values)
+        return self.value
+
+    @property
+    def value(self) -> Optional[float]:
+        if len(self.values) < self.window:
+            return None
+        return self.total / self.window
+
+
+class RollingVariance(StreamingIndicator):
+    """Welford variance over the last ``window`` values (``ddof`` 0 = population)"""
+
+    _deque_fields = ("values",)
+
+    def __init__(self, window: int, ddof: int = 0):
+        self.window = window
+        self.ddof = ddof
+        self.values = deque(maxlen=window)
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.updates = 0
+
+    def update(self, value: float) -> Optional[float]:
+        self.updates += 1
+        if len(self.values) < self.window:
+            self.values.append(value)
+            delta = value - self.mean
+            self.mean += delta / len(self.values)
+            self.m2 += delta * (value - self.mean)
+        elif self.updates % self.window == 0:
+            # Recompute from the window once per window (amortized O(1)) so
+            # rounding error from the sliding updates does not accumulate
+            self.values.append(value)
+            self.mean = math.fsum(self.values) / self.window
+            self.m2 = math.fsum((v - self.mean) ** 2 for v in self.values)
+        else:
+            # Slide: replace the oldest value in one step
+            oldest = self.values[0]
+            self.values.append(value)
+            old_mean = self.mean
+            self.mean += (value - oldest) / self.window
+            self.m2 += (value - oldest) * (value - self.mean + oldest - old_mean)
+            self.m2 = max(self.m2, 0.0)
+        return self.value
+
+    @property
+    def value(self) -> Optional[float]:
+        if len(self.values) < self.window or self.window - self.ddof <= 0:
+            return None
+        return self.m2 / (self.window - self.ddof)
+
+    @property
+    def std(self) -> Optional[float]:
+        variance = self.value
+        return math.sqrt(variance) if variance is not None else None
+
+
+class EMA(StreamingIndicator):
+    """Exponential moving average seeded with the SMA of the first ``period`` values"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        self.count = 0
+        self.seed_total = 0.0
+        self.current = None
+
+    def update(self, value: float) -> Optional[float]:
+        self.count += 1
+        if self.current is not None:
+            self.current += self.alpha * (value - self.current)
+        else:
+            self.seed_total += value
+            if self.count == self.period:
+                self.current = self.seed_total / self.period
+        return self.current
+
+    @property
+    def value(self) -> Optional[float]:
+        return self.current
+
+
+class WilderRSI(StreamingIndicator):
+    """Wilder's RSI over closes"""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev_close = None
+        self.count = 0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+
+    def update(self, value: float) -> Optional[float]:
+        if self.prev_close is None:
+            self.prev_close = value
+            return None
+        delta = value - self.prev_close
+        self.prev_close = value
+        gain, loss = max(delta, 0.0), max(-delta, 0.0)
+        self.count += 1
+        if self.count <= self.period:
+            # Seed phase: running mean of the first ``period`` moves
+            self.avg_gain += (gain - self.avg_gain) / self.count
+            self.avg_loss += (loss - self.avg_loss) / self.count
+        else:
+            self.avg_gain += (gain - self.avg_gain) / self.period
+            self.avg_loss += (loss - self.avg_loss) / self.period
+        return self.value
+
+    @property
+    def value(self) -> Optional[float]:
+        if self.count < self.period:
+            return None
+        if self.avg_loss == 0:
+            return 50.0 if self.avg_gain == 0 else 100.0
+        return 100.0 - 100.0 / (1.0 + self.avg_gain / self.avg_loss)
+
+
+INDICATOR_TYPES = {
+    cls.__name__: cls for cls in (RollingMean, RollingVariance, EMA, WilderRSI)
+}
+
+
+def restore_indicator(snapshot: Dict) -> StreamingIndicator:
+    """Rebuild an indicator from ``StreamingIndicator.snapshot()``"""
+    return INDICATOR_TYPES[snapshot["type"]].from_snapshot(snapshot)
+
+
+class IndicatorSet:
+    """Named indicators for one symbol, updated together"""
+
+    def __init__(self, indicators: Dict[str, StreamingIndicator]):
+        self.indicators = indicators
+
+    def update(self, value: float) -> Dict[str, Optional[float]]:
+        return {name: ind.update(value) for name, ind in self.indicators.items()}
+
+    @property
+    def values(self) -> Dict[str, Optional[float]]:
+        return {name: ind.value for name, ind in self.indicators.items()}
+
+    def snapshot(self) -> Dict:
+        return {name: ind.snapshot() for name, ind in self.indicators.items()}
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Dict) -> "IndicatorSet":
+        return cls({name: restore_indicator(snap) for name, snap in snapshot.items()})
+
+    def copy(self) -> "IndicatorSet":
+        """Independent copy, e.g. to evaluate a candle that may still change"""
+        return IndicatorSet.from_snapshot(self.snapshot())
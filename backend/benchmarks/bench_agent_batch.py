@@ -0,0 +1,75 @@
+"""Agent batch API benchmark: N x POST /analyze vs one POST /analyze_batch.
+
+Drives an agent service in-process over ASGI (no sockets, no event bus
+publishing), so the numbers isolate per-request overhead: routing,
+pydantic validation, logging and the model call. Checks both paths
+return the same analyses.
+
+Run from backend/:
+    python -m benchmarks.bench_agent_batch [--agent chartanalyst] [--items 200] [--rounds 5]
+"""
+import argparse
+import asyncio
+import importlib
+import logging
+import time
+
+import httpx
+import numpy as np
+
+
+def make_items(n, seed=3):
+    rng = np.random.default_rng(seed)
+    symbols = ["EURUSD", "GBPUSD", "USDJPY", "XAUUSD", "BTCUSD"]
+    items = []
+    for i in range(n):
+        closes = 1.1 + np.cumsum(rng.normal(0, 0.001, 50))
+        items.append({
+            "symbol": symbols[i % len(symbols)],
+            "timeframe": "1h",
+            "data": {
+                "candles": [{"close": float(c)} for c in closes],
+                "portfolio": {"total_value": float(rng.uniform(5_000, 50_000))},
+            },
+        })
+    return items
+
+
+async def run(agent, items, rounds):
+    service = importlib.import_module(f"agents.{agent}.main").service
+    service.publish_results = False
+    transport = httpx.ASGITransport(app=service.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://agent") as client:
+        single_s, batch_s = float("inf"), float("inf")
+        for _ in range(rounds):
+            start = time.perf_counter()
+            singles = [(await client.post("/analyze", json=item)).json() for item in items]
+            single_s = min(single_s, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            batch = (await client.post("/analyze_batch", json={"items": items})).json()["results"]
+            batch_s = min(batch_s, time.perf_counter() - start)
+
+    for single, entry in zip(singles, batch):
+        assert entry["error"] is None, entry
+        assert single["data"] == entry["result"]["data"]
+    return single_s, batch_s
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--agent", default="chartanalyst")
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    single_s, batch_s = asyncio.run(run(args.agent, make_items(args.items), args.rounds))
+    print(f"{args.agent}: {args.items} items, best of {args.rounds}")
+    print(f"{'N x /analyze':<18} {single_s * 1000:10.1f} ms {args.items / single_s:>10,.0f} items/s")
+    print(f"{'/analyze_batch':<18} {batch_s * 1000:10.1f} ms {args.items / batch_s:>10,.0f} items/s")
+    print(f"speedup: {single_s / batch_s:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""End-to-end /run_mcp latency: agents over HTTP vs in-process.
+
+Starts the five pipeline agent services as subprocesses on their
+configured ports (result publishing off), then sends the same /run_mcp
+requests to the orchestrator app over in-process ASGI with the pipeline
+switched between AGENT_EXECUTION_MODE=http and inprocess. Checks both
+modes return the same pipeline result, and reports latency percentiles.
+The orchestrator's DB writer is not started, so nothing is persisted.
+
+Run from backend/:
+    python -m benchmarks.bench_agent_modes [--requests 200] [--warmup 20]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+import numpy as np
+
+from config import settings
+from orchestrator.agent_clients import AGENT_PORTS, close_agent_clients, get_agent_client
+from orchestrator.api import app
+from orchestrator.mcp_graph import AGENT_NODE_SPECS, register_mcp_graph
+
+AGENTS = sorted({spec.agent for spec in AGENT_NODE_SPECS.values()})
+
+
+def start_agents():
+    env = {**os.environ, "AGENT_PUBLISH_RESULTS": "false"}
+    return [
+        subprocess.Popen(
+            [sys.executable, "-m", f"agents.{agent}.main"],
+            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        for agent in AGENTS
+    ]
+
+
+async def wait_healthy(timeout=30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        for agent in AGENTS:
+            url = f"http://{settings.agent_http_host}:{AGENT_PORTS[agent]}/health"
+            while True:
+                try:
+                    if (await client.get(url)).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"{agent} did not come up on {url}")
+                await asyncio.sleep(0.2)
+
+
+def comparable(result):
+    """Pipeline result without per-call timestamps"""
+    return {
+        key: {k: v for k, v in value.items() if k != "timestamp"} if isinstance(value, dict) else value
+        for key, value in result.items()
+    }
+
+
+async def run_mode(client, agent_mode, requests, warmup):
+    register_mcp_graph(settings.mcp_execution_mode, agent_mode)
+    payload = {"symbol": "EURUSD", "timeframe": "1h"}
+    for _ in range(warmup):
+        (await client.post("/run_mcp", json=payload)).raise_for_status()
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = await client.post("/run_mcp", json=payload)
+        latencies.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+    return np.array(latencies), response.json()
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    processes = start_agents()
+    try:
+        await wait_healthy()
+        get_agent_client("inprocess").service  # agents imported up front, not on the first request
+        for agent in AGENTS:
+            get_agent_client("inprocess").service(agent).publish_results = False
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://orchestrator") as client:
+            results = {}
+            print(f"/run_mcp ({settings.mcp_execution_mode} pipeline), {args.requests} sequential requests")
+            print(f"{'agents':<10} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+            for agent_mode in ("http", "inprocess"):
+                latencies, results[agent_mode] = await run_mode(client, agent_mode, args.requests, args.warmup)
+                p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+                print(f"{agent_mode:<10} {latencies.mean():9.2f} {p50:9.2f} {p95:9.2f} {p99:9.2f}")
+        assert comparable(results["http"]) == comparable(results["inprocess"]), results
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+        await close_agent_clients()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+"""Scalping breakout detection benchmark.
+
+Compares the previous per-tick loop (O(n*w) Python work) with the O(n)
+sliding-window-max detector in agents/marketsentinel/utils.py, and checks
+that both find the same breakouts.
+
+Run from backend/:
+    python -m benchmarks.bench_breakouts [--ticks 1000000] [--window 10]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from agents.marketsentinel.utils import BreakoutDetector, detect_scalping_opportunities, find_breakouts
+
+
+def legacy_breakouts(tick_data, window=10, threshold=0.001):
+    """The previous detection loop, returning every hit instead of the first 5"""
+    opportunities = []
+    for i in range(window, len(tick_data)):
+        current_price = float(tick_data[i].get("price", 0))
+        prev_prices = [float(tick_data[j].get("price", 0)) for j in range(i - window, i)]
+        if current_price > max(prev_prices) * (1 + threshold):
+            opportunities.append((i, min((current_price / max(prev_prices) - 1) * 1000, 10)))
+    return opportunities
+
+
+def make_ticks(n, seed=11):
+    rng = np.random.default_rng(seed)
+    prices = 1.1 * np.exp(np.cumsum(rng.normal(0, 0.0004, n)))
+    return prices, [{"price": p, "timestamp": i} for i, p in enumerate(prices.tolist())]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ticks", type=int, default=1_000_000)
+    parser.add_argument("--window", type=int, default=10)
+    parser.add_argument("--top-k", type=int, default=5)
+    args = parser.parse_args()
+
+    # Equivalence on a smaller series
+    prices, ticks = make_ticks(20_000)
+    legacy = legacy_breakouts(ticks, args.window)
+    indices, strengths = find_breakouts(prices, args.window, top_k=len(legacy) or 1)
+    assert sorted(indices.tolist()) == [i for i, _ in legacy]
+    np.testing.assert_allclose(
+        strengths[np.argsort(indices)], [s for _, s in legacy], rtol=1e-12
+    )
+    streaming = BreakoutDetector(args.window, top_k=args.top_k)
+    for i, p in enumerate(prices.tolist()):
+        streaming.update(p, i)
+    assert [o["timestamp"] for o in streaming.top()] == indices[:args.top_k].tolist()
+    print(f"equivalence check: {len(legacy)} breakouts match the legacy loop")
+
+    prices, ticks = make_ticks(args.ticks)
+    print(f"{args.ticks:,} ticks, window={args.window}, top_k={args.top_k}")
+
+    start = time.perf_counter()
+    legacy_breakouts(ticks, args.window)
+    legacy_s = time.perf_counter() - start
+    print(f"legacy per-tick loop:                 {legacy_s * 1000:10.1f} ms")
+
+    start = time.perf_counter()
+    detect_scalping_opportunities(ticks, args.window, top_k=args.top_k)
+    dicts_s = time.perf_counter() - start
+    print(f"detect_scalping_opportunities (dicts): {dicts_s * 1000:9.1f} ms")
+
+    start = time.perf_counter()
+    find_breakouts(prices, args.window, top_k=args.top_k)
+    array_s = time.perf_counter() - start
+    print(f"find_breakouts (NumPy array):          {array_s * 1000:9.1f} ms")
+
+    detector = BreakoutDetector(args.window, top_k=args.top_k)
+    start = time.perf_counter()
+    for p in prices.tolist():
+        detector.update(p)
+    stream_s = time.perf_counter() - start
+    print(f"BreakoutDetector (per-tick stream):    {stream_s * 1000:9.1f} ms "
+          f"({args.ticks / stream_s:,.0f} ticks/s)")
+    print(f"speedup vs legacy: dicts {legacy_s / dicts_s:.0f}x, array {legacy_s / array_s:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Signal persistence throughput: row-at-a-time vs the write-behind BulkWriter.
+
+Needs a Postgres to write to, e.g. the compose service:
+    docker compose up -d postgres
+
+Run from backend/ (DATABASE_URL defaults to settings.database_url):
+    python -m benchmarks.bench_bulk_writes [--rows 20000] [--batch-size 500]
+
+Each mode writes the same synthetic TradeSignal rows and reports rows/s.
+Rows are tagged with a unique timeframe and deleted afterwards.
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, insert, select
+
+from db.bulk_writer import BulkWriter
+from db.db_session import engine, init_db
+from db.models import TradeSignal
+
+
+def make_rows(n, tag):
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "timestamp": start + timedelta(seconds=i),
+            "symbol": ("EURUSD", "GBPUSD", "USDJPY", "XAUUSD")[i % 4],
+            "timeframe": tag,
+            "signal_type": ("BUY", "SELL", "HOLD")[i % 3],
+            "confidence": (i % 100) / 100,
+            "signal_data": {"reasoning": "EMA crossover with rising RSI", "rsi_14": 55.2, "atr_14": 0.0012},
+            "macro_context": {"summary": "Risk-on"},
+            "processed": False,
+        }
+        for i in range(n)
+    ]
+
+
+async def count_and_clean(tag):
+    async with engine.begin() as conn:
+        count = (await conn.execute(select(func.count()).where(TradeSignal.timeframe == tag))).scalar()
+        await conn.execute(delete(TradeSignal).where(TradeSignal.timeframe == tag))
+    return count
+
+
+async def row_at_a_time(rows):
+    for row in rows:
+        async with engine.begin() as conn:
+            await conn.execute(insert(TradeSignal).values(row))
+
+
+async def write_behind(rows, method, batch_size):
+    writer = BulkWriter(engine, batch_size=batch_size, max_buffered=len(rows), method=method)
+    await writer.start()
+    writer.mark_ready()
+    writer.add_many(TradeSignal, rows)
+    await writer.close()
+    assert writer.metrics["failed_rows"] == writer.metrics["dropped_rows"] == 0, writer.stats()
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--single-rows", type=int, default=2_000, help="rows for the slow row-at-a-time mode")
+    args = parser.parse_args()
+
+    await init_db()
+    modes = [
+        ("row-at-a-time INSERT + commit", args.single_rows, row_at_a_time),
+        ("BulkWriter multi-row INSERT", args.rows, lambda rows: write_behind(rows, "insert", args.batch_size)),
+        ("BulkWriter COPY", args.rows, lambda rows: write_behind(rows, "copy", args.batch_size)),
+    ]
+    for name, n, run in modes:
+        tag = f"bench-{uuid.uuid4().hex[:8]}"
+        rows = make_rows(n, tag)
+        start = time.perf_counter()
+        await run(rows)
+        elapsed = time.perf_counter() - start
+        written = await count_and_clean(tag)
+        assert written == n, f"{name}: wrote {written} of {n} rows"
+        print(f"{name:<32} {n:>7,} rows {elapsed:8.2f} s {n / elapsed:>12,.0f} rows/s")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
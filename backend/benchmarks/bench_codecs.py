@@ -0,0 +1,98 @@
+"""Event bus / WebSocket codec benchmark.
+
+Encodes and decodes AgentOutput-shaped messages with every available codec
+in orchestrator/codecs.py, checks they round-trip to the same dict, and
+reports throughput and payload size. Also times a broadcast to N clients
+encoded once versus once per connection (the old ``send_json`` path).
+
+Run from backend/:
+    python -m benchmarks.bench_codecs [--messages 20000] [--clients 200]
+"""
+import argparse
+import json
+import time
+from datetime import datetime
+
+import numpy as np
+
+from orchestrator import codecs
+
+
+def make_messages(n, seed=5):
+    """Messages shaped like an agent's AgentOutput after publish() enrichment"""
+    rng = np.random.default_rng(seed)
+    symbols = ["EURUSD", "GBPUSD", "USDJPY", "XAUUSD", "BTCUSD"]
+    messages = []
+    for i in range(n):
+        close = float(1.1 + rng.normal(0, 0.01))
+        messages.append({
+            "agent_name": "chartanalyst",
+            "timestamp": datetime(2024, 1, 1, 12, 0, i % 60, i % 1000 * 1000),
+            "symbol": symbols[i % len(symbols)],
+            "confidence": float(rng.random()),
+            "signal_type": ["BUY", "SELL", "HOLD"][i % 3],
+            "reasoning": "EMA12 crossed above EMA26 with RSI rising from oversold; ATR expanding",
+            "data": {
+                "indicators": {
+                    "sma_10": close, "sma_20": close - 0.001, "ema_12": close + 0.0004,
+                    "ema_26": close - 0.0002, "rsi_14": float(rng.uniform(20, 80)),
+                    "atr_14": 0.0012, "macd": 0.0006, "macd_signal": 0.0004,
+                    "bb_upper": close + 0.004, "bb_middle": close, "bb_lower": close - 0.004,
+                },
+                "patterns": ["bullish_engulfing", "higher_low"],
+                "levels": [round(close + k * 0.0025, 5) for k in range(-3, 4)],
+            },
+            "metadata": {"model": "mistral", "latency_ms": float(rng.uniform(50, 400))},
+            "channel": "chartanalyst_out",
+        })
+    return messages
+
+
+def expected(message):
+    """What a consumer sees: datetimes become ISO strings"""
+    return json.loads(json.dumps(message, default=lambda v: v.isoformat()))
+
+
+def bench(codec, messages):
+    start = time.perf_counter()
+    payloads = [codec.encode(m) for m in messages]
+    encode_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    decoded = [codec.decode(p) for p in payloads]
+    decode_s = time.perf_counter() - start
+
+    assert decoded[0] == expected(messages[0]), codec.name
+    assert codecs.detect_codec(payloads[0]).decode(payloads[0]) == decoded[0]
+    size = sum(len(p) for p in payloads) / len(payloads)
+    return encode_s, decode_s, size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=20_000)
+    parser.add_argument("--clients", type=int, default=200)
+    args = parser.parse_args()
+
+    messages = make_messages(args.messages)
+    print(f"{args.messages:,} AgentOutput-like messages; codecs: {', '.join(codecs.CODECS)}")
+    print(f"{'codec':<8} {'encode msg/s':>14} {'decode msg/s':>14} {'avg bytes':>10}")
+    for name, codec in codecs.CODECS.items():
+        encode_s, decode_s, size = bench(codec, messages)
+        print(f"{name:<8} {args.messages / encode_s:>14,.0f} {args.messages / decode_s:>14,.0f} {size:>10.0f}")
+
+    # Broadcast: the old path serialized the same dict for every connection
+    message = expected(messages[0])
+    start = time.perf_counter()
+    for _ in range(args.clients):
+        json.dumps(message)
+    per_client_s = time.perf_counter() - start
+    start = time.perf_counter()
+    codecs.JSON.encode(message).decode("utf-8")
+    once_s = time.perf_counter() - start
+    print(f"broadcast to {args.clients} clients: per-connection json {per_client_s * 1e6:,.0f} us, "
+          f"encode once ({codecs.JSON.name}) {once_s * 1e6:,.1f} us")
+
+
+if __name__ == "__main__":
+    main()
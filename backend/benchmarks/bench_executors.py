@@ -0,0 +1,83 @@
+"""Event-loop responsiveness with agent analytics inline vs offloaded.
+
+Runs a batch of concurrent analytics jobs on long price histories while a
+heartbeat coroutine ticks every millisecond, and reports the batch's wall
+time and how late the heartbeat got (a stand-in for every other request
+the agent is serving). Two workloads:
+
+- analyze_volatility: NumPy, inline vs the thread pool
+- warm_volatility: a pure-Python loop, inline vs thread vs the process
+  pool (price arrays passed through shared memory)
+
+Run from backend/:
+    python -m benchmarks.bench_executors [--prices 1000000] [--jobs 8]
+"""
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from agents.executors import INLINE, PROCESS, THREAD, ComputeExecutors
+from agents.marketsentinel.utils import analyze_volatility, warm_volatility
+
+
+def make_prices(n, seed=9):
+    rng = np.random.default_rng(seed)
+    return 1.1 * np.exp(np.cumsum(rng.normal(0, 1e-4, n)))
+
+
+async def heartbeat(lags, stop):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append((time.perf_counter() - start) * 1000 - 1)
+
+
+async def run_jobs(executors, fn, args, jobs, kind):
+    lags, stop = [], asyncio.Event()
+    beat = asyncio.create_task(heartbeat(lags, stop))
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    results = await asyncio.gather(*(executors.run(fn, *args, kind=kind) for _ in range(jobs)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await beat
+    return results[0], elapsed, max(lags), float(np.percentile(lags, 99))
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--prices", type=int, default=1_000_000)
+    parser.add_argument("--jobs", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    prices = make_prices(args.prices)
+    executors = ComputeExecutors(thread_workers=args.workers, process_workers=args.workers)
+    # Start the worker processes so spawn time is not charged to the first run
+    await asyncio.gather(*(executors.run(warm_volatility, prices[:10], kind=PROCESS) for _ in range(args.workers)))
+
+    workloads = [
+        ("analyze_volatility", analyze_volatility, (prices, 20), (INLINE, THREAD)),
+        ("warm_volatility", warm_volatility, (prices[: args.prices // 4], 20), (INLINE, THREAD, PROCESS)),
+    ]
+    print(f"{args.jobs} concurrent jobs, {args.workers} workers per pool")
+    print(f"{'workload':<20} {'kind':<8} {'wall s':>8} {'max lag ms':>11} {'p99 lag ms':>11}")
+    try:
+        for name, fn, fn_args, kinds in workloads:
+            baseline = None
+            for kind in kinds:
+                result, elapsed, max_lag, p99_lag = await run_jobs(executors, fn, fn_args, args.jobs, kind)
+                baseline = baseline if baseline is not None else result
+                assert result == baseline, f"{name} {kind} result differs"
+                print(f"{name:<20} {kind:<8} {elapsed:8.2f} {max_lag:11.1f} {p99_lag:11.1f}")
+        for name, timings in executors.stats()["functions"].items():
+            print(f"{name}: queue wait avg {timings['queue_wait']['avg_ms']:.1f} ms, "
+                  f"run avg {timings['run']['avg_ms']:.1f} ms")
+    finally:
+        executors.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,210 @@
+"""Indicator engine benchmark and reference check.
+
+Checks the vectorized engine in agents/chartanalyst/indicators.py against
+straightforward per-bar Python implementations and the latest-value path
+against the full series, then times it against the previous dict-based
+``calculate_indicators`` path.
+
+Run from backend/:
+    python -m benchmarks.bench_indicators [--symbols 100] [--bars 5000]
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+from agents.chartanalyst import indicators
+from agents.chartanalyst.utils import calculate_indicators
+
+
+# --- Reference implementations (plain Python, one series at a time) ---
+
+def ref_sma(values, window):
+    return [
+        sum(values[i - window + 1:i + 1]) / window if i >= window - 1 else math.nan
+        for i in range(len(values))
+    ]
+
+
+def ref_seeded(values, alpha, period, start=0):
+    out = [math.nan] * len(values)
+    first = start + period - 1
+    if len(values) <= first:
+        return out
+    prev = sum(values[start:first + 1]) / period
+    out[first] = prev
+    for i in range(first + 1, len(values)):
+        prev = alpha * values[i] + (1 - alpha) * prev
+        out[i] = prev
+    return out
+
+
+def ref_ema(values, period):
+    return ref_seeded(values, 2 / (period + 1), period)
+
+
+def ref_rsi(close, period=14):
+    deltas = [close[i] - close[i - 1] for i in range(1, len(close))]
+    gains = ref_seeded([max(d, 0) for d in deltas], 1 / period, period)
+    losses = ref_seeded([max(-d, 0) for d in deltas], 1 / period, period)
+    out = [math.nan]
+    for g, l in zip(gains, losses):
+        if math.isnan(g):
+            out.append(math.nan)
+        elif l == 0:
+            out.append(50.0 if g == 0 else 100.0)
+        else:
+            out.append(100 - 100 / (1 + g / l))
+    return out
+
+
+def ref_macd(close, fast=12, slow=26, signal=9):
+    line = [f - s for f, s in zip(ref_ema(close, fast), ref_ema(close, slow))]
+    sig = ref_seeded(line, 2 / (signal + 1), signal, start=slow - 1)
+    return line, sig
+
+
+def ref_atr(high, low, close, period=14):
+    tr = [high[0] - low[0]] + [
+        max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+        for i in range(1, len(close))
+    ]
+    return ref_seeded(tr, 1 / period, period, start=1)
+
+
+def ref_bollinger(close, window=20, num_std=2.0):
+    mid = ref_sma(close, window)
+    upper, lower = [], []
+    for i, m in enumerate(mid):
+        if math.isnan(m):
+            upper.append(math.nan)
+            lower.append(math.nan)
+            continue
+        win = close[i - window + 1:i + 1]
+        std = math.sqrt(sum((v - m) ** 2 for v in win) / window)
+        upper.append(m + num_std * std)
+        lower.append(m - num_std * std)
+    return upper, mid, lower
+
+
+def ref_vwap(high, low, close, volume):
+    out, pv, vol = [], 0.0, 0.0
+    for h, l, c, v in zip(high, low, close, volume):
+        pv += (h + l + c) / 3 * v
+        vol += v
+        out.append(pv / vol if vol > 0 else math.nan)
+    return out
+
+
+def legacy_calculate_indicators(candles):
+    """The dict-based calculate_indicators this engine replaced"""
+    if not candles:
+        return {}
+    closes = [float(c.get("close", 0)) for c in candles[-20:]]
+    if len(closes) >= 10:
+        return {"sma_10": sum(closes[-10:]) / 10, "sma_20": sum(closes) / len(closes)}
+    return {}
+
+
+# --- Harness ---
+
+def make_ohlcv(n_symbols, n_bars, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 1.1 * np.exp(np.cumsum(rng.normal(0, 0.001, (n_symbols, n_bars)), axis=-1))
+    spread = np.abs(rng.normal(0, 0.0008, (n_symbols, n_bars)))
+    high = close + spread
+    low = close - spread
+    volume = rng.integers(100, 10_000, (n_symbols, n_bars)).astype(np.float64)
+    return high, low, close, volume
+
+
+def check_reference(n_bars=600, rtol=1e-9, atol=1e-10):
+    high, low, close, volume = (a[0] for a in make_ohlcv(1, n_bars))
+    h, l, c, v = high.tolist(), low.tolist(), close.tolist(), volume.tolist()
+    got = indicators.compute_indicators(high, low, close, volume)
+    macd_line, macd_signal = ref_macd(c)
+    bb_upper, bb_mid, bb_lower = ref_bollinger(c)
+    expected = {
+        "sma_10": ref_sma(c, 10),
+        "sma_20": ref_sma(c, 20),
+        "ema_12": ref_ema(c, 12),
+        "ema_26": ref_ema(c, 26),
+        "rsi_14": ref_rsi(c),
+        "atr_14": ref_atr(h, l, c),
+        "macd": macd_line,
+        "macd_signal": macd_signal,
+        "bb_upper": bb_upper,
+        "bb_middle": bb_mid,
+        "bb_lower": bb_lower,
+        "vwap": ref_vwap(h, l, c, v),
+    }
+    for name, ref in expected.items():
+        np.testing.assert_allclose(got[name], np.array(ref), rtol=rtol, atol=atol, equal_nan=True, err_msg=name)
+    print(f"reference check: {len(expected)} indicators match within rtol={rtol}, atol={atol}")
+
+
+def check_latest(n_bars=2000, rtol=1e-9, atol=1e-12):
+    """latest_indicators over the last LOOKBACK bars vs the full-history series"""
+    high, low, close, volume = (a[0] for a in make_ohlcv(1, n_bars))
+    full = {name: indicators.latest(values) for name, values in indicators.compute_indicators(high, low, close).items()}
+    window = slice(-indicators.LOOKBACK, None)
+    got = indicators.latest_indicators(high[window], low[window], close[window])
+    for name, expected in full.items():
+        np.testing.assert_allclose(got[name], expected, rtol=rtol, atol=atol, err_msg=name)
+    print(f"latest check: last {indicators.LOOKBACK} of {n_bars} bars match the full history within rtol={rtol}")
+
+
+def timed(fn, repeat=3):
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=100)
+    parser.add_argument("--bars", type=int, default=5000)
+    args = parser.parse_args()
+
+    check_reference()
+    check_latest()
+
+    high, low, close, volume = make_ohlcv(args.symbols, args.bars)
+    candles = [
+        [
+            {"high": h, "low": l, "close": c, "volume": v}
+            for h, l, c, v in zip(high[s].tolist(), low[s].tolist(), close[s].tolist(), volume[s].tolist())
+        ]
+        for s in range(args.symbols)
+    ]
+    print(f"{args.symbols} symbols x {args.bars} bars")
+
+    # Latest-value path: what ChartAnalyst needs per scan
+    legacy = timed(lambda: [legacy_calculate_indicators(c) for c in candles])
+    print(f"legacy dict path (SMA10/20 only, last bar):       {legacy * 1000:9.2f} ms")
+    current = timed(lambda: [calculate_indicators(c) for c in candles])
+    print(f"calculate_indicators (dicts in, all indicators):  {current * 1000:9.2f} ms")
+
+    # Full series, every bar
+    engine = timed(lambda: indicators.compute_indicators(high, low, close, volume))
+    print(f"engine, all 13 series, all symbols in one pass:   {engine * 1000:9.2f} ms")
+
+    def reference_all():
+        for s in range(min(args.symbols, 5)):
+            c = close[s].tolist()
+            ref_sma(c, 10), ref_sma(c, 20), ref_ema(c, 12), ref_ema(c, 26), ref_rsi(c), ref_macd(c)
+            ref_atr(high[s].tolist(), low[s].tolist(), c), ref_bollinger(c)
+            ref_vwap(high[s].tolist(), low[s].tolist(), c, volume[s].tolist())
+
+    sample = min(args.symbols, 5)
+    reference = timed(reference_all, repeat=1) * args.symbols / sample
+    print(f"pure-Python reference, all series (extrapolated): {reference * 1000:9.2f} ms")
+    print(f"engine speedup vs pure Python: {reference / engine:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from sqlalchemy import JSON, insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from config import settings
+import db.db_session as db_session
+from db.db_session import is_connection_error
+from db.models import MacroEvent, TradeOutcome, TradeSignal
+from metrics import Timing
+
+logger = logging.getLogger(__name__)
+
+# Flushed in this order so rows referencing a trade_signals row written
+# in the same flush find their parent
+WRITE_ORDER = (TradeSignal, MacroEvent, TradeOutcome)
+
+
+class BulkWriter:
+    """Write-behind buffer for signal, macro-event and outcome rows.
+
+    ``add`` queues a row (a dict of column values) and returns without
+    touching the database. A background task writes the buffers when any
+    model reaches ``batch_size`` rows or every ``flush_interval`` seconds,
+    as multi-row INSERTs (``method="insert"``) or ``COPY`` (``"copy"``,
+    Postgres only). Nothing is written until ``mark_ready`` (tables
+    created). At most ``max_buffered`` rows are held, counting rows being
+    written; ``add`` never waits, rows beyond that are dropped and counted.
+    Rows the database could not be reached for stay buffered and the writer
+    backs off between flushes; a chunk the database rejects is split so
+    only the bad rows are dropped. ``close`` flushes everything still
+    buffered.
+    """
+
+    def __init__(
+        self,
+        engine: Optional[AsyncEngine] = None,
+        batch_size: int = 500,
+        flush_interval: float = 0.5,
+        max_buffered: int = 20000,
+        method: str = "insert",
+        max_retries: int = 3,
+        max_backoff: float = 30.0,
+    ):
+        if method not in ("insert", "copy"):
+            raise ValueError(f"Unknown write method: {method}")
+        self._engine = engine
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffered = max(max_buffered, batch_size)
+        self.method = method
+        self.max_retries = max_retries
+        self.max_backoff = max_backoff
+        self._buffers: Dict[type, List[Dict]] = defaultdict(list)
+        self._buffered = 0
+        self._wake = asyncio.Event()
+        self._ready = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self.flush_timing = Timing()
+        self.metrics = {
+            "rows_written": defaultdict(int),
+            "flushes": 0,
+            "failed_rows": 0,
+            "dropped_rows": 0,
+            "deferred_flushes": 0,
+        }
+
+    @property
+    def engine(self) -> AsyncEngine:
+        return self._engine or db_session.engine
+
+    async def start(self):
+        if self._task is None:
+            self._closing = False
+            self._task = asyncio.create_task(self._run())
+
+    def mark_ready(self):
+        """The tables exist: start writing buffered rows"""
+        self._ready.set()
+        self._wake.set()
+
+    async def close(self):
+        """Stop the background task and write everything still buffered"""
+        if self._task:
+            # Let an in-flight flush finish rather than cancelling it mid-write
+            self._closing = True
+            self._wake.set()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._ready.is_set():
+            await self.flush()
+        if self._buffered:
+            logger.warning(f"Discarding {self._buffered} unwritten rows on shutdown")
+
+    def add(self, model: type, row: Dict) -> bool:
+        return self.add_many(model, [row]) == 1
+
+    def add_many(self, model: type, rows: List[Dict]) -> int:
+        """Buffer ``rows``; returns how many fit, the rest are dropped"""
+        if model not in WRITE_ORDER:
+            raise ValueError(f"{model.__name__} is not written by BulkWriter")
+        accepted = rows[:max(0, self.max_buffered - self._buffered)]
+        if len(accepted) < len(rows):
+            dropped = len(rows) - len(accepted)
+            if not self.metrics["dropped_rows"]:
+                logger.warning(f"Write buffer full ({self.max_buffered} rows), dropping {model.__tablename__} rows")
+            self.metrics["dropped_rows"] += dropped
+        self._buffers[model].extend(accepted)
+        self._buffered += len(accepted)
+        if len(self._buffers[model]) >= self.batch_size:
+            self._wake.set()
+        return len(accepted)
+
+    async def _run(self):
+        backoff = 0.0
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wake.wait(), max(self.flush_interval, backoff))
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            if not self._ready.is_set():
+                continue
+            written = False
+            try:
+                written = await self.flush()
+            except Exception as e:
+                logger.error(f"Bulk write flush failed: {e}")
+            if written:
+                backoff = 0.0
+            else:
+                backoff = min(max(backoff * 2, self.flush_interval * 2), self.max_backoff)
+
+    async def flush(self) -> bool:
+        """Write all buffered rows now; False if the database was unreachable.
+
+        Rows that could not be written because of that stay buffered for the
+        next flush.
+        """
+        async with self._flush_lock:
+            buffers, self._buffers = self._buffers, defaultdict(list)
+            if not any(buffers.values()):
+                return True
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            unwritten = {model: buffers.get(model, []) for model in WRITE_ORDER}
+            try:
+                for model, rows in unwritten.items():
+                    while rows:
+                        chunk = rows[:self.batch_size]
+                        kept = await self._write_with_retry(model, chunk)
+                        del rows[:len(chunk)]
+                        self._buffered -= len(chunk) - len(kept)
+                        if kept:
+                            rows[:0] = kept
+                            self.metrics["deferred_flushes"] += 1
+                            return False
+            finally:
+                # Unreachable database or cancelled mid-flush: rows not yet
+                # written go back in front of the buffers (still counted in
+                # _buffered), parents before children, for the next flush
+                for model, rows in unwritten.items():
+                    if rows:
+                        self._buffers[model][:0] = rows
+            self.flush_timing.record((loop.time() - start) * 1000)
+            self.metrics["flushes"] += 1
+            return True
+
+    async def _write_with_retry(self, model: type, rows: List[Dict]) -> List[Dict]:
+        """Write ``rows``; returns the ones to keep because the database was unreachable"""
+        table = model.__tablename__
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self._write(model, rows)
+                self.metrics["rows_written"][table] += len(rows)
+                return []
+            except Exception as e:
+                if not is_connection_error(e):
+                    if len(rows) == 1:
+                        self.metrics["failed_rows"] += 1
+                        logger.error(f"Dropping a {table} row the database rejected: {e}")
+                        return []
+                    # Most likely a few bad rows: split so the good ones are still written
+                    middle = len(rows) // 2
+                    return (
+                        await self._write_with_retry(model, rows[:middle])
+                        + await self._write_with_retry(model, rows[middle:])
+                    )
+                if attempt == self.max_retries:
+                    logger.warning(f"Database unreachable ({e}), keeping {len(rows)} {table} rows for the next flush")
+                    return rows
+                delay = 0.1 * 2 ** attempt
+                logger.warning(f"Bulk write to {table} failed ({e}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    async def _write(self, model: type, rows: List[Dict]):
+        # Rows with different column sets cannot share one statement
+        groups = defaultdict(list)
+        for row in rows:
+            groups[tuple(sorted(row))].append(row)
+        async with self.engine.begin() as conn:
+            for columns, group in groups.items():
+                if self.method == "copy":
+                    await self._copy(conn, model, columns, group)
+                else:
+                    await conn.execute(insert(model).values(group))
+
+    @staticmethod
+    async def _copy(conn, model: type, columns: tuple, rows: List[Dict]):
+        """COPY rows through asyncpg's binary copy protocol"""
+        json_columns = {c.name for c in model.__table__.columns if isinstance(c.type, JSON)}
+        records = [
+            tuple(json.dumps(row[c]) if c in json_columns and row[c] is not None else row[c] for c in columns)
+            for row in rows
+        ]
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            model.__tablename__, records=records, columns=list(columns)
+        )
+
+    def stats(self) -> Dict:
+        return {
+            "method": self.method,
+            "ready": self._ready.is_set(),
+            "buffered": self._buffered,
+            "max_buffered": self.max_buffered,
+            **{k: dict(v) if isinstance(v, defaultdict) else v for k, v in self.metrics.items()},
+            "flush": self.flush_timing.to_dict(),
+        }
+
+
+bulk_writer = BulkWriter(
+    batch_size=settings.db_write_batch_size,
+    flush_interval=settings.db_write_flush_interval,
+    max_buffered=settings.db_write_max_buffered,
+    method=settings.db_write_method,
+)
@@ -1,36 +1,98 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
+import asyncio
+import time
+from typing import AsyncGenerator, Dict
+
+from sqlalchemy import exc, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from config import settings
+from metrics import Timing
 import logging
 
 logger = logging.getLogger(__name__)
 
+checkout_latency = Timing()
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each connection checkout waits"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            checkout_latency.record((time.perf_counter() - start) * 1000)
+
+
+def async_database_url(url: str) -> str:
+    """Point a plain postgresql:// URL at the asyncpg driver"""
+    parsed = make_url(url)
+    if parsed.drivername in ("postgresql", "postgres", "postgresql+psycopg2"):
+        parsed = parsed.set(drivername="postgresql+asyncpg")
+    return parsed.render_as_string(hide_password=False)
+
+
 # Create engine
-engine = create_engine(
-    settings.database_url,
+engine = create_async_engine(
+    async_database_url(settings.database_url),
+    poolclass=TimedQueuePool,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
     pool_pre_ping=True,
-    pool_recycle=300,
+    query_cache_size=settings.db_query_cache_size,
+    connect_args={"prepared_statement_cache_size": settings.db_statement_cache_size},
 )
 
 # Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
-def get_db() -> Session:
-    db = SessionLocal()
-    try:
-        yield db
-    except Exception as e:
-        logger.error(f"Database error: {e}")
-        db.rollback()
-        raise
-    finally:
-        db.close()
-
-def init_db():
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    async with SessionLocal() as db:
+        try:
+            yield db
+        except Exception as e:
+            logger.error(f"Database error: {e}")
+            await db.rollback()
+            raise
+
+def is_connection_error(error: Exception) -> bool:
+    """True when the database could not be reached, as opposed to rejecting the statement"""
+    if isinstance(error, (OSError, asyncio.TimeoutError, exc.TimeoutError, exc.InterfaceError, exc.OperationalError)):
+        return True
+    return isinstance(error, exc.DBAPIError) and error.connection_invalidated
+
+async def ping():
+    """Cheapest possible round trip, used by the readiness probe"""
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+async def init_db():
     """Initialize database tables"""
     from db.models import Base
-    Base.metadata.create_all(bind=engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        # create_all skips indexes on tables that already exist
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                await conn.run_sync(index.create, checkfirst=True)
+        # Superseded by the composite (symbol, timestamp, signal_id) index
+        await conn.execute(text("DROP INDEX IF EXISTS ix_trade_signals_symbol"))
     logger.info("Database tables created successfully")
+
+def pool_stats() -> Dict:
+    """Connections in use/idle and checkout wait times"""
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "checkout_latency": checkout_latency.to_dict(),
+    }
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, JSON, ForeignKey, Boolean, Text
+from sqlalchemy import Column, Integer, String, DateTime, Float, JSON, ForeignKey, Boolean, Text, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -22,8 +22,8 @@ class TradeSignal(Base):
     __tablename__ = "trade_signals"
 
     signal_id = Column(Integer, primary_key=True, index=True)
-    timestamp = Column(DateTime(timezone=True), server_default=func.now())
-    symbol = Column(String, index=True)
+    timestamp = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    symbol = Column(String)  # covered by ix_trade_signals_symbol_ts_id
     timeframe = Column(String)
     agent_id = Column(Integer, ForeignKey("agents.agent_id"))
     signal_type = Column(String)  # BUY, SELL, HOLD
@@ -36,6 +36,14 @@ class TradeSignal(Base):
     agent = relationship("Agent", back_populates="signals")
     outcome = relationship("TradeOutcome", back_populates="signal", uselist=False)
 
+    # Newest-first keyset scans on (timestamp, signal_id), optionally filtered
+    __table_args__ = (
+        Index("ix_trade_signals_ts_id", "timestamp", "signal_id"),
+        Index("ix_trade_signals_symbol_ts_id", "symbol", "timestamp", "signal_id"),
+        Index("ix_trade_signals_agent_ts_id", "agent_id", "timestamp", "signal_id"),
+        Index("ix_trade_signals_type_ts_id", "signal_type", "timestamp", "signal_id"),
+    )
+
 class TradeOutcome(Base):
     __tablename__ = "trade_outcomes"
 
@@ -0,0 +1,89 @@
+import base64
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models import Agent, TradeSignal
+
+
+def encode_cursor(timestamp: datetime, signal_id: int) -> str:
+    """Opaque keyset cursor for the row a page ended on"""
+    raw = f"{timestamp.isoformat()}|{signal_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverse of ``encode_cursor``; raises ValueError on a malformed cursor"""
+    try:
+        timestamp, signal_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|")
+        return datetime.fromisoformat(timestamp), int(signal_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+# Summary columns for the signal feed; signal_data is never loaded whole,
+# only its "reasoning" field is extracted in the database
+SIGNAL_SUMMARY_COLUMNS = (
+    TradeSignal.signal_id,
+    TradeSignal.timestamp,
+    TradeSignal.symbol,
+    TradeSignal.timeframe,
+    TradeSignal.signal_type,
+    TradeSignal.confidence,
+    Agent.name.label("agent_name"),
+    TradeSignal.signal_data["reasoning"].as_string().label("reasoning"),
+)
+
+
+async def list_signals(
+    db: AsyncSession,
+    symbol: Optional[str] = None,
+    agent: Optional[str] = None,
+    signal_type: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    min_confidence: Optional[float] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Dict], Optional[str]]:
+    """Newest-first page of signal summaries plus the cursor for the next page.
+
+    Pages are keyed on ``(timestamp, signal_id)`` rather than OFFSET, so each
+    page is an index range scan whatever its depth.
+    """
+    # Tables created before timestamp was NOT NULL may still hold NULL rows,
+    # which have no place in the keyset order
+    query = (
+        select(*SIGNAL_SUMMARY_COLUMNS)
+        .outerjoin(Agent, TradeSignal.agent_id == Agent.agent_id)
+        .where(TradeSignal.timestamp.isnot(None))
+    )
+    if symbol:
+        query = query.where(TradeSignal.symbol == symbol)
+    if agent:
+        # Resolve the name first so the (agent_id, timestamp, signal_id) index drives the scan
+        agent_id = select(Agent.agent_id).where(Agent.name == agent).scalar_subquery()
+        query = query.where(TradeSignal.agent_id == agent_id)
+    if signal_type:
+        query = query.where(TradeSignal.signal_type == signal_type)
+    if since:
+        query = query.where(TradeSignal.timestamp >= since)
+    if until:
+        query = query.where(TradeSignal.timestamp < until)
+    if min_confidence is not None:
+        query = query.where(TradeSignal.confidence >= min_confidence)
+    if cursor:
+        timestamp, signal_id = decode_cursor(cursor)
+        query = query.where(tuple_(TradeSignal.timestamp, TradeSignal.signal_id) < tuple_(timestamp, signal_id))
+
+    # One extra row tells us whether another page exists
+    query = query.order_by(TradeSignal.timestamp.desc(), TradeSignal.signal_id.desc()).limit(limit + 1)
+    rows = [dict(row) for row in (await db.execute(query)).mappings()]
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["timestamp"], rows[-1]["signal_id"])
+    return rows, next_cursor
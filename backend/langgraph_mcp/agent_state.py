@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, Dict
+from typing import Any, Optional, Dict
 
 class AgentState(BaseModel):
     symbol: str
@@ -7,5 +7,5 @@ class AgentState(BaseModel):
     signal_type: Optional[str] = None
     confidence: Optional[float] = None
     reasoning: Dict[str, str] = {}
-    raw_data: Dict[str, any] = {}
+    raw_data: Dict[str, Any] = {}
     next_agent: Optional[str] = None
@@ -1,5 +1,7 @@
 from langgraph.graph import StateGraph, END
+from config import settings
 from langgraph_mcp.agent_state import AgentState
+from langgraph_mcp.parallel import run_branches
 from langgraph_mcp.nodes.chart_analyst import chart_analyst_node
 from langgraph_mcp.nodes.macro_forecaster import macro_forecaster_node
 from langgraph_mcp.nodes.risk_manager import risk_manager_node
@@ -7,21 +9,72 @@ from langgraph_mcp.nodes.market_sentinel import market_sentinel_node
 from langgraph_mcp.nodes.tacticbot import tacticbot_node
 from langgraph_mcp.nodes.platform_pilot import platform_pilot_node
 
-builder = StateGraph(AgentState)
+# Analysts that only read symbol/timeframe and can run concurrently
+ANALYST_NODES = {
+    "ChartAnalyst": chart_analyst_node,
+    "MacroForecaster": macro_forecaster_node,
+    "MarketSentinel": market_sentinel_node,
+}
 
-builder.add_node("ChartAnalyst", chart_analyst_node)
-builder.add_node("MacroForecaster", macro_forecaster_node)
-builder.add_node("RiskManager", risk_manager_node)
-builder.add_node("MarketSentinel", market_sentinel_node)
-builder.add_node("TacticBot", tacticbot_node)
-builder.add_node("PlatformPilot", platform_pilot_node)
+def _as_update(node):
+    """Adapt a node that mutates and returns AgentState into a state update"""
+    def run(state: AgentState) -> dict:
+        return node(state).model_dump()
+    return run
 
-builder.set_entry_point("ChartAnalyst")
-builder.add_edge("ChartAnalyst", "MacroForecaster")
-builder.add_edge("MacroForecaster", "RiskManager")
-builder.add_edge("RiskManager", "MarketSentinel")
-builder.add_edge("MarketSentinel", "TacticBot")
-builder.add_edge("TacticBot", "PlatformPilot")
-builder.add_edge("PlatformPilot", END)
+def join_analysts(state: AgentState, results: dict, skipped: list) -> AgentState:
+    """Merge the analyst branch outputs back into a single AgentState"""
+    merged = state.model_copy(deep=True)
+    for branch in results.values():
+        merged.reasoning.update(branch.reasoning)
+        merged.raw_data.update(branch.raw_data)
+        if branch.signal_type is not None:
+            merged.signal_type = branch.signal_type
+        if branch.confidence is not None:
+            merged.confidence = branch.confidence
+    for name in skipped:
+        merged.reasoning[name] = "Skipped: timed out or failed"
+    merged.next_agent = "RiskManager"
+    return merged
 
-agent_graph = builder.compile()
+async def analysts_node(state: AgentState) -> dict:
+    """Fan out to the independent analysts and join their outputs"""
+    results, skipped = await run_branches(
+        ANALYST_NODES,
+        lambda: state.model_copy(deep=True),
+        timeout=settings.mcp_branch_timeout,
+    )
+    return join_analysts(state, results, skipped).model_dump()
+
+def build_agent_graph(mode: str = settings.mcp_execution_mode) -> StateGraph:
+    """Build the agent graph in "dag" or "sequential" mode.
+
+    The "dag" graph has an async fan-out node and must be run with ``ainvoke``.
+    """
+    builder = StateGraph(AgentState)
+
+    builder.add_node("RiskManager", _as_update(risk_manager_node))
+    builder.add_node("TacticBot", _as_update(tacticbot_node))
+    builder.add_node("PlatformPilot", _as_update(platform_pilot_node))
+
+    if mode == "dag":
+        builder.add_node("Analysts", analysts_node)
+        builder.set_entry_point("Analysts")
+        builder.add_edge("Analysts", "RiskManager")
+        builder.add_edge("RiskManager", "TacticBot")
+    elif mode == "sequential":
+        for name, node in ANALYST_NODES.items():
+            builder.add_node(name, _as_update(node))
+        builder.set_entry_point("ChartAnalyst")
+        builder.add_edge("ChartAnalyst", "MacroForecaster")
+        builder.add_edge("MacroForecaster", "RiskManager")
+        builder.add_edge("RiskManager", "MarketSentinel")
+        builder.add_edge("MarketSentinel", "TacticBot")
+    else:
+        raise ValueError(f"Unknown MCP execution mode: {mode}")
+
+    builder.add_edge("TacticBot", "PlatformPilot")
+    builder.add_edge("PlatformPilot", END)
+    return builder
+
+agent_graph = build_agent_graph().compile()
@@ -0,0 +1,53 @@
+import asyncio
+import inspect
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+async def _run_branch(fn: Callable, state: Any) -> Any:
+    if inspect.iscoroutinefunction(fn):
+        return await fn(state)
+    # Sync agents run in a worker thread so branches overlap
+    return await asyncio.to_thread(fn, state)
+
+
+async def run_branches(
+    branches: Dict[str, Callable],
+    make_input: Callable[[], Any],
+    timeout: Optional[float] = None,
+) -> Tuple[Dict[str, Any], List[str]]:
+    """Run independent agent branches concurrently.
+
+    Each branch receives its own copy of the state from ``make_input`` so
+    branches never mutate shared state. A branch that raises or exceeds
+    ``timeout`` seconds is skipped rather than failing the whole fan-out.
+
+    Sync branches run via ``asyncio.to_thread``, and a thread cannot be
+    cancelled: a timed-out sync branch keeps running in the background and
+    holds a slot of the loop's default executor until it returns. Make
+    branches async if they can hang.
+
+    Returns the results of the successful branches (in ``branches`` order) and
+    the names of the skipped ones.
+    """
+    names = list(branches)
+    tasks = [
+        asyncio.wait_for(_run_branch(branches[name], make_input()), timeout)
+        for name in names
+    ]
+    outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+
+    results: Dict[str, Any] = {}
+    skipped: List[str] = []
+    for name, outcome in zip(names, outcomes):
+        if isinstance(outcome, asyncio.TimeoutError):
+            logger.warning(f"Branch {name} timed out after {timeout}s, skipping")
+            skipped.append(name)
+        elif isinstance(outcome, Exception):
+            logger.error(f"Branch {name} failed, skipping: {outcome}")
+            skipped.append(name)
+        else:
+            results[name] = outcome
+    return results, skipped
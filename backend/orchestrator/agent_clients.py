@@ -0,0 +1,90 @@
+import asyncio
+import importlib
+import logging
+from typing import Dict
+
+from agents.base import AgentInput
+from agents.http_client import AsyncHTTPClient
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# How the MCP pipeline reaches the agents: "stub" keeps the placeholder
+# nodes, "http" calls each agent service's /analyze, "inprocess" imports
+# the agent and calls it directly
+AGENT_EXECUTION_MODES = ("stub", "http", "inprocess")
+
+AGENT_PORTS = {
+    "chartanalyst": settings.chartanalyst_port,
+    "riskmanager": settings.riskmanager_port,
+    "marketsentinel": settings.marketsentinel_port,
+    "macroforecaster": settings.macroforecaster_port,
+    "tacticbot": settings.tacticbot_port,
+    "platformpilot": settings.platformpilot_port,
+}
+
+
+class HTTPAgentClient:
+    """Calls agent services over HTTP through a pooled keep-alive client"""
+
+    mode = "http"
+
+    def __init__(self, host: str = "localhost", timeout: float = 10.0, per_host_limit: int = 10):
+        self.base_urls = {agent: f"http://{host}:{port}" for agent, port in AGENT_PORTS.items()}
+        # No retries: a failed agent is skipped by the pipeline, like a timed-out one
+        self.http = AsyncHTTPClient(per_host_limit=per_host_limit, timeout=timeout, max_retries=0, http2=False)
+
+    async def analyze(self, agent: str, payload: Dict) -> Dict:
+        """POST ``payload`` (an AgentInput) to the agent's /analyze; returns the AgentOutput JSON"""
+        response = await self.http.post(f"{self.base_urls[agent]}/analyze", json=payload)
+        response.raise_for_status()
+        return response.json()
+
+    async def aclose(self):
+        await self.http.aclose()
+
+
+class InProcessAgentClient:
+    """Calls agents in this process: same input validation and output JSON as the HTTP path"""
+
+    mode = "inprocess"
+
+    def __init__(self):
+        self._services = {}
+
+    def service(self, agent: str):
+        if agent not in self._services:
+            self._services[agent] = importlib.import_module(f"agents.{agent}.main").service
+        return self._services[agent]
+
+    async def analyze(self, agent: str, payload: Dict) -> Dict:
+        result = await self.service(agent).analyze(AgentInput.model_validate(payload))
+        return result.model_dump(mode="json")
+
+    async def aclose(self):
+        """Wait for the agents' pending result publishes; the event bus is the orchestrator's to close"""
+        await asyncio.gather(*(service.drain_publishes() for service in self._services.values()))
+
+
+_clients: Dict[str, object] = {}
+
+def get_agent_client(mode: str = settings.agent_execution_mode):
+    """Shared client for ``mode``; None for "stub" (no agent calls)"""
+    if mode not in AGENT_EXECUTION_MODES:
+        raise ValueError(f"Unknown agent execution mode: {mode}")
+    if mode == "stub":
+        return None
+    if mode not in _clients:
+        if mode == "http":
+            _clients[mode] = HTTPAgentClient(
+                host=settings.agent_http_host,
+                timeout=settings.agent_http_timeout,
+                per_host_limit=settings.agent_http_concurrency,
+            )
+        else:
+            _clients[mode] = InProcessAgentClient()
+    return _clients[mode]
+
+async def close_agent_clients():
+    for client in _clients.values():
+        await client.aclose()
@@ -0,0 +1,313 @@
+import asyncio
+import itertools
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Union
+
+from fastapi import WebSocket
+
+from orchestrator import codecs
+from orchestrator.codecs import Codec
+from metrics import Timing
+
+logger = logging.getLogger(__name__)
+
+# Slow-consumer policies for a full client queue
+COALESCE_LATEST = "coalesce_latest"  # keep the newest frame per symbol, drop the oldest otherwise
+DISCONNECT = "disconnect"  # close the socket (code 1013, try again later)
+
+SLOW_CONSUMER_POLICIES = (COALESCE_LATEST, DISCONNECT)
+
+Frame = Union[str, bytes]
+
+WILDCARD = "*"
+# Topic dimension -> message fields it is read from (top level, then ``data``)
+TOPIC_FIELDS = {
+    "symbol": ("symbol",),
+    "agent": ("agent_name", "agent"),
+    "signal_type": ("signal_type",),
+    "type": ("type",),
+}
+
+
+def message_symbol(message: Dict[str, Any]) -> Optional[str]:
+    """Symbol a broadcast is about, used as the coalescing key"""
+    symbol = message.get("symbol")
+    if symbol is None and isinstance(message.get("data"), dict):
+        symbol = message["data"].get("symbol")
+    return symbol
+
+
+def message_topics(message: Dict[str, Any]) -> List[str]:
+    """Topics a broadcast belongs to, e.g. ``["symbol:EURUSD", "agent:chartanalyst"]``"""
+    data = message.get("data") if isinstance(message.get("data"), dict) else {}
+    topics = []
+    for dimension, fields in TOPIC_FIELDS.items():
+        for field in fields:
+            value = message.get(field, data.get(field))
+            if value is not None:
+                topics.append(f"{dimension}:{value}")
+                break
+    return topics
+
+
+def parse_topics(request: Dict[str, Any]) -> List[str]:
+    """Topics from a subscribe/unsubscribe request.
+
+    Accepts ``{"topics": ["symbol:EURUSD", "*"]}`` and/or dimension keys
+    with a value or list, e.g. ``{"symbol": ["EURUSD", "GBPUSD"], "agent": "riskmanager"}``.
+    """
+    topics = list(request.get("topics") or [])
+    for dimension in TOPIC_FIELDS:
+        values = request.get(dimension)
+        if values is None:
+            continue
+        for value in values if isinstance(values, list) else [values]:
+            topics.append(f"{dimension}:{value}")
+    return [str(t) for t in topics]
+
+
+class WebSocketClient:
+    """One socket with a bounded outbound queue drained by its own writer task"""
+
+    def __init__(self, websocket: WebSocket, codec: Codec, maxsize: int, policy: str, send_timeout: float):
+        self.websocket = websocket
+        self.codec = codec
+        self.maxsize = maxsize
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self.closed = False
+        self.slow = False
+        self.topics: Set[str] = {WILDCARD}
+        self._buffer: "OrderedDict[int, Frame]" = OrderedDict()
+        self._by_symbol: Dict[Any, int] = {}
+        self._seq = itertools.count()
+        self._ready = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+        self.send_latency = Timing()
+        self.metrics = {"sent": 0, "dropped": 0, "coalesced": 0, "max_depth": 0}
+
+    def start(self):
+        self._writer = asyncio.create_task(self._write())
+
+    def offer(self, frame: Frame, symbol: Optional[str] = None) -> bool:
+        """Queue a frame without waiting; False if the client was dropped as too slow"""
+        if self.closed:
+            return False
+        if len(self._buffer) >= self.maxsize:
+            if self.policy == DISCONNECT:
+                logger.warning(f"Disconnecting slow WebSocket client ({len(self._buffer)} frames queued)")
+                self.slow = True
+                self.close(code=1013)
+                return False
+            # Behind: replace the queued frame for this symbol in place,
+            # otherwise make room by dropping the oldest frame
+            queued = self._by_symbol.get((type(frame), symbol)) if symbol is not None else None
+            if queued in self._buffer:
+                self._buffer[queued] = frame
+                self.metrics["coalesced"] += 1
+                return True
+            self._buffer.popitem(last=False)
+            self.metrics["dropped"] += 1
+        key = next(self._seq)
+        if symbol is not None:
+            self._by_symbol[(type(frame), symbol)] = key
+        self._buffer[key] = frame
+        self.metrics["max_depth"] = max(self.metrics["max_depth"], len(self._buffer))
+        self._ready.set()
+        return True
+
+    async def _write(self):
+        try:
+            while True:
+                await self._ready.wait()
+                while self._buffer:
+                    _, frame = self._buffer.popitem(last=False)
+                    start = time.perf_counter()
+                    if isinstance(frame, bytes):
+                        await asyncio.wait_for(self.websocket.send_bytes(frame), self.send_timeout)
+                    else:
+                        await asyncio.wait_for(self.websocket.send_text(frame), self.send_timeout)
+                    self.send_latency.record((time.perf_counter() - start) * 1000)
+                    self.metrics["sent"] += 1
+                self._by_symbol.clear()
+                self._ready.clear()
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.info(f"WebSocket writer stopped: {e!r}")
+            self.close()
+
+    def close(self, code: Optional[int] = None):
+        """Stop the writer; with ``code``, also close the socket"""
+        if self.closed:
+            return
+        self.closed = True
+        self._buffer.clear()
+        self._by_symbol.clear()
+        if self._writer and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+        if code is not None:
+            asyncio.create_task(self._close_socket(code))
+
+    async def _close_socket(self, code: int):
+        try:
+            await self.websocket.close(code=code)
+        except Exception:
+            pass
+
+    def stats(self) -> Dict:
+        return {
+            "codec": self.codec.name,
+            "topics": sorted(self.topics),
+            "queue_depth": len(self._buffer),
+            **self.metrics,
+            "send_latency": self.send_latency.to_dict(),
+        }
+
+
+class ConnectionManager:
+    """Fans broadcasts out to WebSocket clients without awaiting any socket.
+
+    ``broadcast`` encodes the message once per codec in use and queues the
+    frame on every client; each client's writer task sends at its own pace.
+    Clients start subscribed to every message (``*``) and can narrow that
+    with topics such as ``symbol:EURUSD``, ``agent:riskmanager`` or
+    ``signal_type:BUY``; a message goes to clients subscribed to any of its
+    topics. Routing goes through a topic index, so a broadcast only touches
+    (and only encodes for) interested clients.
+
+    A client that keeps up gets every frame. Once its queue is full,
+    ``coalesce_latest`` overwrites the queued frame for the same symbol with
+    the newer one (or drops the oldest frame if that symbol has none queued)
+    and ``disconnect`` closes the socket.
+    """
+
+    def __init__(self, maxsize: int = 100, policy: str = COALESCE_LATEST, send_timeout: float = 5.0):
+        if policy not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(f"Unknown slow-consumer policy: {policy}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self.clients: Dict[WebSocket, WebSocketClient] = {}
+        self.topic_index: Dict[str, Set[WebSocket]] = {}
+        self.metrics = {"broadcasts": 0, "deliveries": 0, "unrouted": 0, "slow_disconnects": 0}
+        # Counters of clients that have gone away, so totals survive disconnects
+        self._retired = {"sent": 0, "dropped": 0}
+
+    @property
+    def active_connections(self) -> List[WebSocket]:
+        return list(self.clients)
+
+    async def connect(self, websocket: WebSocket, codec: Optional[Codec] = None) -> WebSocketClient:
+        await websocket.accept()
+        client = WebSocketClient(websocket, codec or codecs.JSON, self.maxsize, self.policy, self.send_timeout)
+        client.start()
+        self.clients[websocket] = client
+        self._index(websocket, client.topics)
+        return client
+
+    def disconnect(self, websocket: WebSocket):
+        client = self.clients.pop(websocket, None)
+        if client:
+            self._retire(client)
+            client.close()
+
+    def _index(self, websocket: WebSocket, topics: Iterable[str]):
+        for topic in topics:
+            self.topic_index.setdefault(topic, set()).add(websocket)
+
+    def _unindex(self, websocket: WebSocket, topics: Iterable[str]):
+        for topic in topics:
+            sockets = self.topic_index.get(topic)
+            if sockets is not None:
+                sockets.discard(websocket)
+                if not sockets:
+                    del self.topic_index[topic]
+
+    def subscribe(self, websocket: WebSocket, topics: List[str]) -> Set[str]:
+        """Add topics; the first specific topic replaces the default ``*``"""
+        client = self.clients.get(websocket)
+        if client is None:
+            return set()
+        topics = set(topics)
+        if topics and WILDCARD not in topics and client.topics == {WILDCARD}:
+            self._unindex(websocket, [WILDCARD])
+            client.topics = set()
+        self._index(websocket, topics - client.topics)
+        client.topics |= topics
+        return client.topics
+
+    def unsubscribe(self, websocket: WebSocket, topics: List[str]) -> Set[str]:
+        client = self.clients.get(websocket)
+        if client is None:
+            return set()
+        topics = set(topics) & client.topics
+        self._unindex(websocket, topics)
+        client.topics -= topics
+        return client.topics
+
+    def _retire(self, client: WebSocketClient):
+        """Drop a departing client from the index and fold its counters into the totals"""
+        self._unindex(client.websocket, client.topics)
+        self._retired["sent"] += client.metrics["sent"]
+        self._retired["dropped"] += client.metrics["dropped"]
+
+    def send(self, websocket: WebSocket, frame: Frame) -> bool:
+        """Queue a frame for one client"""
+        client = self.clients.get(websocket)
+        return client.offer(frame) if client else False
+
+    def recipients(self, message: dict) -> Set[WebSocket]:
+        """Sockets subscribed to ``*`` or to any of the message's topics"""
+        recipients = set(self.topic_index.get(WILDCARD, ()))
+        for topic in message_topics(message):
+            recipients |= self.topic_index.get(topic, set())
+        return recipients
+
+    async def broadcast(self, message: dict) -> int:
+        """Queue ``message`` for every interested client; returns how many accepted it"""
+        self.metrics["broadcasts"] += 1
+        recipients = self.recipients(message)
+        if not recipients:
+            self.metrics["unrouted"] += 1
+            return 0
+        symbol = message_symbol(message)
+        frames: Dict[str, Frame] = {}
+        accepted = 0
+        for websocket in recipients:
+            client = self.clients.get(websocket)
+            if client is None:
+                continue
+            codec = client.codec
+            if codec.name not in frames:
+                payload = codec.encode(message)
+                frames[codec.name] = payload if codec.binary else payload.decode("utf-8")
+            if client.offer(frames[codec.name], symbol):
+                accepted += 1
+            elif client.closed and self.clients.pop(websocket, None):
+                # Too slow, or its writer hit a send error
+                self.metrics["slow_disconnects"] += client.slow
+                self._retire(client)
+        self.metrics["deliveries"] += accepted
+        return accepted
+
+    async def close(self):
+        for websocket in list(self.clients):
+            self.disconnect(websocket)
+
+    def stats(self) -> Dict:
+        clients = [client.stats() for client in self.clients.values()]
+        return {
+            "policy": self.policy,
+            "clients": len(clients),
+            "queue_depth": sum(c["queue_depth"] for c in clients),
+            "max_queue_depth": max((c["queue_depth"] for c in clients), default=0),
+            "dropped": self._retired["dropped"] + sum(c["dropped"] for c in clients),
+            "coalesced": sum(c["coalesced"] for c in clients),
+            "sent": self._retired["sent"] + sum(c["sent"] for c in clients),
+            **self.metrics,
+            "topics": {topic: len(sockets) for topic, sockets in self.topic_index.items()},
+            "per_client": clients,
+        }
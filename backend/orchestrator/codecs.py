@@ -0,0 +1,138 @@
+"""Pluggable payload codecs for the event bus and WebSocket broadcasts.
+
+Every codec turns a message dict into bytes and back. Datetimes are encoded
+as ISO-8601 strings by all of them, so consumers see the same ``timestamp``
+whichever codec produced the message. ``detect_codec`` picks the decoder
+from the payload's first byte (JSON objects start with ``{``, msgpack maps
+do not), which lets publishers switch codecs without coordinating every
+subscriber. orjson and msgpack are optional; ``get_codec`` falls back to
+stdlib JSON when the library is missing.
+"""
+import json
+import logging
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+
+def _default(value: Any):
+    """Fallback for types the codec cannot encode natively"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, "tolist"):  # NumPy scalars and arrays
+        return value.tolist()
+    if hasattr(value, "model_dump"):  # pydantic models
+        return value.model_dump()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+class Codec(ABC):
+    """Encode/decode message dicts; ``binary`` codecs go out as WebSocket binary frames"""
+
+    name = ""
+    content_type = ""
+    binary = False
+
+    @abstractmethod
+    def encode(self, message: Any) -> bytes:
+        """Message to bytes"""
+
+    @abstractmethod
+    def decode(self, payload: bytes) -> Any:
+        """Bytes back to the message"""
+
+
+class JsonCodec(Codec):
+    name = "json"
+    content_type = "application/json"
+
+    def encode(self, message: Any) -> bytes:
+        return json.dumps(message, default=_default, separators=(",", ":")).encode("utf-8")
+
+    def decode(self, payload: bytes) -> Any:
+        return json.loads(payload)
+
+
+class OrjsonCodec(Codec):
+    name = "orjson"
+    content_type = "application/json"
+
+    def encode(self, message: Any) -> bytes:
+        return orjson.dumps(message, default=_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+    def decode(self, payload: bytes) -> Any:
+        return orjson.loads(payload)
+
+
+class MsgpackCodec(Codec):
+    name = "msgpack"
+    content_type = "application/msgpack"
+    binary = True
+
+    def encode(self, message: Any) -> bytes:
+        return msgpack.packb(message, default=_default, use_bin_type=True, datetime=False)
+
+    def decode(self, payload: bytes) -> Any:
+        return msgpack.unpackb(payload, raw=False)
+
+
+def _available() -> Dict[str, Codec]:
+    codecs = {"json": JsonCodec()}
+    if orjson is not None:
+        codecs["orjson"] = OrjsonCodec()
+    if msgpack is not None:
+        codecs["msgpack"] = MsgpackCodec()
+    return codecs
+
+
+CODECS = _available()
+# Fastest available implementation per content type
+JSON = CODECS.get("orjson", CODECS["json"])
+
+
+def get_codec(name: Optional[str]) -> Codec:
+    """Codec by name, falling back to JSON if its library is not installed"""
+    codec = CODECS.get((name or "json").lower())
+    if codec is None:
+        logger.warning(f"Codec {name} is not available, falling back to {JSON.name}")
+        return JSON
+    return codec
+
+
+def negotiate(accept: Optional[str], default: Optional[Codec] = None) -> Codec:
+    """Pick a codec from an Accept-style value: content types or codec names, comma separated"""
+    for part in (accept or "").split(","):
+        token = part.split(";")[0].strip().lower()
+        if not token:
+            continue
+        if token in ("application/msgpack", "application/x-msgpack", "msgpack") and "msgpack" in CODECS:
+            return CODECS["msgpack"]
+        if token in ("application/json", "json", "orjson"):
+            return JSON
+    return default or JSON
+
+
+def detect_codec(payload: bytes) -> Codec:
+    """Decoder for a payload produced by any of the codecs above"""
+    if payload[:1] in (b"{", b"[") or "msgpack" not in CODECS:
+        return JSON
+    return CODECS["msgpack"]
+
+
+def decode(payload: bytes) -> Any:
+    return detect_codec(payload).decode(payload)
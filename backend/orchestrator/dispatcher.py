@@ -0,0 +1,169 @@
+import asyncio
+import itertools
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, List, Optional
+
+from metrics import Timing
+
+logger = logging.getLogger(__name__)
+
+# Overflow policies for a full subscriber queue
+DROP_OLDEST = "drop_oldest"  # discard the oldest queued message
+BLOCK = "block"  # overflow waits in order for queue space, up to maxsize more
+COALESCE_LATEST = "coalesce_latest"  # keep only the newest message per (channel, symbol)
+
+OVERFLOW_POLICIES = (DROP_OLDEST, BLOCK, COALESCE_LATEST)
+
+
+class Subscription:
+    """One callback with its own bounded queue and worker tasks.
+
+    Messages are queued by ``put`` and delivered by ``concurrency`` workers,
+    so a slow callback only delays its own queue. ``put`` never waits, so
+    the shared listener is never held up by one subscriber. With ``block``
+    a full queue keeps up to ``maxsize`` further messages, in order, in an
+    overflow list that refills the queue as the workers free space; the
+    listener checks ``backlogged`` to stop reading more for this subscriber
+    where the transport allows it (streams). Past that cap messages are
+    dropped (``overflow_dropped``) so a stalled subscriber cannot grow
+    memory without bound on pub/sub. With ``coalesce_latest`` a newer message
+    for a symbol that is still queued replaces the queued one in place.
+    Messages without a symbol are never coalesced.
+
+    ``put`` takes an optional ``on_done(ok)`` hook, called once the message
+    has been handled: ``ok`` is False when the callback raised or the
+    ``block`` overflow was full, so streams leave the entry pending for
+    redelivery. Other dropped and coalesced-away messages count as handled.
+    """
+
+    def __init__(
+        self,
+        channel: str,
+        callback: Callable,
+        maxsize: int = 1000,
+        policy: str = DROP_OLDEST,
+        concurrency: int = 1,
+    ):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        if maxsize < 1:
+            raise ValueError(f"Subscriber queue size must be at least 1, got {maxsize}")
+        self.channel = channel
+        self.callback = callback
+        self.maxsize = maxsize
+        self.policy = policy
+        self.concurrency = max(1, concurrency)
+
+        self._buffer: "OrderedDict[Any, tuple]" = OrderedDict()
+        self._overflow: "deque[tuple]" = deque()  # (key, item) waiting for space under BLOCK
+        self._seq = itertools.count()
+        self._ready = asyncio.Event()
+        self._workers: List[asyncio.Task] = []
+
+        self.latency = Timing()
+        self.queue_wait = Timing()
+        self.metrics = {
+            "delivered": 0,
+            "dropped": 0,
+            "coalesced": 0,
+            "errors": 0,
+            "max_depth": 0,
+            "max_overflow": 0,
+            "overflow_dropped": 0,
+        }
+
+    @property
+    def name(self) -> str:
+        return getattr(self.callback, "__qualname__", repr(self.callback))
+
+    def _key(self, channel: str, data: Any):
+        if self.policy == COALESCE_LATEST and isinstance(data, dict) and data.get("symbol"):
+            return (channel, data["symbol"])
+        return next(self._seq)
+
+    def start(self):
+        """Start the worker tasks (needs a running event loop)"""
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    @staticmethod
+    def _finish(item: tuple, ok: bool):
+        on_done = item[3]
+        if on_done is not None:
+            on_done(ok)
+
+    @property
+    def backlogged(self) -> bool:
+        """True while ``block`` overflow is waiting for queue space"""
+        return bool(self._overflow)
+
+    def put(self, channel: str, data: Any, on_done: Optional[Callable[[bool], None]] = None):
+        """Queue a message without waiting, applying the overflow policy if the queue is full"""
+        item = (time.perf_counter(), channel, data, on_done)
+        key = self._key(channel, data)
+        if key in self._buffer:
+            self._finish(self._buffer[key], True)
+            self._buffer[key] = item
+            self.metrics["coalesced"] += 1
+            return
+        if self._overflow or len(self._buffer) >= self.maxsize:
+            if self.policy == BLOCK:
+                if len(self._overflow) >= self.maxsize:
+                    if not self.metrics["overflow_dropped"]:
+                        logger.warning(f"Subscriber {self.name} on {channel} is {self.maxsize} messages behind, dropping")
+                    self.metrics["overflow_dropped"] += 1
+                    self._finish(item, False)
+                    return
+                self._overflow.append((key, item))
+                self.metrics["max_overflow"] = max(self.metrics["max_overflow"], len(self._overflow))
+                return
+            _, dropped = self._buffer.popitem(last=False)
+            self._finish(dropped, True)
+            self.metrics["dropped"] += 1
+        self._buffer[key] = item
+        self.metrics["max_depth"] = max(self.metrics["max_depth"], len(self._buffer))
+        self._ready.set()
+
+    async def _worker(self):
+        while True:
+            while not self._buffer:
+                self._ready.clear()
+                await self._ready.wait()
+            _, item = self._buffer.popitem(last=False)
+            if self._overflow:
+                key, waiting = self._overflow.popleft()
+                self._buffer[key] = waiting
+
+            enqueued_at, channel, data, _ = item
+            start = time.perf_counter()
+            self.queue_wait.record((start - enqueued_at) * 1000)
+            try:
+                await self.callback(channel, data)
+                self.metrics["delivered"] += 1
+                self._finish(item, True)
+            except Exception as e:
+                self.metrics["errors"] += 1
+                logger.error(f"Subscriber {self.name} on {channel} failed: {e}")
+                self._finish(item, False)
+            finally:
+                self.latency.record((time.perf_counter() - start) * 1000)
+
+    def stats(self) -> Dict:
+        return {
+            "callback": self.name,
+            "policy": self.policy,
+            "queue_depth": len(self._buffer),
+            "overflow": len(self._overflow),
+            "maxsize": self.maxsize,
+            **self.metrics,
+            "callback_latency": self.latency.to_dict(),
+            "queue_wait": self.queue_wait.to_dict(),
+        }
@@ -1,35 +1,111 @@
 import asyncio
 import redis.asyncio as aioredis  # if you want to keep the same naming
-import json
 import logging
-from typing import Dict, Any, Callable, List
-from datetime import datetime
+import time
+from typing import Dict, Any, Callable, List, Optional
+from datetime import datetime, timezone
+
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+
+from config import settings
+from orchestrator import codecs
+from orchestrator.dispatcher import Subscription
+from metrics import Timing
+from orchestrator.publisher import BatchPublisher
+from orchestrator.streams import StreamTransport
 
 logger = logging.getLogger(__name__)
 
+
+def is_pattern(channel: str) -> bool:
+    """True for glob-style channel patterns such as ``signals.*``"""
+    return any(c in channel for c in "*?[")
+
+
 class EventBus:
-    """Redis-based event bus for agent communication"""
+    """Redis-based event bus for agent communication.
+
+    ``transport`` is "pubsub" (Redis PUBLISH/SUBSCRIBE) or "streams" (Redis
+    Streams with consumer groups, see ``orchestrator/streams.py``); the
+    publish/subscribe API is the same for both. With Pub/Sub, a channel
+    containing ``*``, ``?`` or ``[`` is subscribed as a pattern.
+    """
     
-    def __init__(self, redis_url: str = "redis://localhost:6379"):
+    def __init__(self, redis_url: str = "redis://localhost:6379", transport: Optional[str] = None):
         self.redis_url = redis_url
+        self.transport = transport or settings.event_bus_transport
         self.redis = None
         self.pubsub = None
+        self.streams = None
+        self.publisher = None
+        self.codec = codecs.get_codec(settings.event_bus_codec)
         self.subscribers = {}
         self.running = False
+        self.lag = Timing()
+        self.reconnects = 0
+        self._listener = None
+        self._has_subscriptions = asyncio.Event()
+        self._connect_lock = asyncio.Lock()
         
     async def connect(self):
         """Connect to Redis"""
         try:
             self.redis = aioredis.Redis.from_url(self.redis_url)
+            if self.transport == "streams":
+                self.streams = StreamTransport(
+                    self.redis,
+                    group=settings.event_bus_stream_group,
+                    consumer=settings.event_bus_consumer_name,
+                    prefix=settings.event_bus_stream_prefix,
+                    maxlen=settings.event_bus_stream_maxlen,
+                    batch_size=settings.event_bus_stream_batch_size,
+                    block_ms=settings.event_bus_stream_block_ms,
+                    claim_idle_ms=settings.event_bus_stream_claim_idle_ms,
+                    max_deliveries=settings.event_bus_stream_max_deliveries,
+                )
+            else:
+                self.pubsub = self.redis.pubsub()
+            if settings.event_bus_publish_linger_ms > 0:
+                self.publisher = BatchPublisher(
+                    self._send_batch,
+                    max_batch=settings.event_bus_publish_batch_size,
+                    linger_ms=settings.event_bus_publish_linger_ms,
+                )
             
-            logger.info("Connected to Redis event bus")
+            logger.info(f"Connected to Redis event bus ({self.transport})")
         except Exception as e:
             logger.error(f"Failed to connect to Redis: {e}")
             raise
     
+    async def _ensure_connected(self):
+        """Connect once, even when many publishers race on first use"""
+        if self.redis:
+            return
+        async with self._connect_lock:
+            if not self.redis:
+                await self.connect()
+    
+    async def ping(self):
+        """Round trip to Redis, used by the readiness probe"""
+        await self._ensure_connected()
+        await self.redis.ping()
+
     async def disconnect(self):
         """Disconnect from Redis"""
         self.running = False
+        if self._listener and self._listener is not asyncio.current_task():
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+        for subscriptions in self.subscribers.values():
+            for subscription in subscriptions:
+                await subscription.stop()
+        if self.publisher:
+            await self.publisher.flush()
+        if self.streams:
+            try:
+                await self.streams.flush_acks()
+            except Exception as e:
+                logger.error(f"Failed to flush stream acks: {e}")
         if self.pubsub:
             await self.pubsub.close()
         if self.redis:
@@ -37,70 +113,267 @@ class EventBus:
         logger.info("Disconnected from Redis")
     
     async def publish(self, channel: str, message: Dict[str, Any]):
-        """Publish message to channel"""
+        """Publish message to channel; returns once its batch has been sent"""
         try:
-            if not self.redis:
-                await self.connect()
+            await self._ensure_connected()
             
-            # Add metadata
+            # Add metadata (UTC-aware, so lag is right across hosts and timezones)
             enriched_message = {
                 **message,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": datetime.now(timezone.utc),
                 "channel": channel
             }
             
-            await self.redis.publish(channel, json.dumps(enriched_message))
+            payload = self.codec.encode(enriched_message)
+            if self.publisher:
+                result = await self.publisher.submit(channel, payload)
+            elif self.streams:
+                result = await self.streams.publish(channel, payload)
+            else:
+                result = await self.redis.publish(channel, payload)
             logger.debug(f"Published to {channel}: {message}")
+            return result
             
         except Exception as e:
             logger.error(f"Failed to publish to {channel}: {e}")
             raise
     
-    async def subscribe(self, channel: str, callback: Callable):
-        """Subscribe to channel with callback"""
+    async def subscribe(
+        self,
+        channel: str,
+        callback: Callable,
+        policy: Optional[str] = None,
+        maxsize: Optional[int] = None,
+        concurrency: Optional[int] = None,
+    ) -> Subscription:
+        """Subscribe to channel with callback, delivered from its own bounded queue"""
         try:
-            if channel not in self.subscribers:
-                self.subscribers[channel] = []
-            
-            self.subscribers[channel].append(callback)
-            await self.pubsub.subscribe(channel)
+            await self._ensure_connected()
+            if self.streams and is_pattern(channel):
+                raise ValueError("Pattern subscriptions need the pubsub transport")
+            subscription = Subscription(
+                channel,
+                callback,
+                maxsize=maxsize or settings.event_bus_queue_size,
+                policy=policy or settings.event_bus_overflow_policy,
+                concurrency=concurrency or settings.event_bus_workers_per_subscriber,
+            )
+            # Registered (and its workers started) only once Redis has the
+            # subscription, so a failed subscribe leaves nothing behind
+            if self.streams:
+                await self.streams.ensure_group(channel)
+            elif is_pattern(channel):
+                await self.pubsub.psubscribe(channel)
+            else:
+                await self.pubsub.subscribe(channel)
+            subscription.start()
+            self.subscribers.setdefault(channel, []).append(subscription)
+            self._has_subscriptions.set()
             logger.info(f"Subscribed to channel: {channel}")
+            return subscription
             
         except Exception as e:
             logger.error(f"Failed to subscribe to {channel}: {e}")
             raise
     
+    async def _send_batch(self, batch: List[tuple]) -> List[Any]:
+        """Send (channel, payload) pairs in one pipeline round trip"""
+        if self.streams:
+            return await self.streams.publish_many(batch)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for channel, payload in batch:
+                pipe.publish(channel, payload)
+            return await pipe.execute(raise_on_error=False)
+    
     async def start_listening(self):
         """Start listening for messages"""
+        self._listener = asyncio.current_task()
+        if self.transport == "streams":
+            return await self._listen_streams()
         if not self.pubsub:
             await self.connect()
         
         self.running = True
         logger.info("Started listening for events")
+        attempt = 0
         
         try:
             while self.running:
-                message = await self.pubsub.get_message(timeout=1.0)
-                if message and message['type'] == 'message':
-                    await self._handle_message(message)
+                # listen() returns straight away while nothing is subscribed
+                await self._has_subscriptions.wait()
+                try:
+                    async for message in self.pubsub.listen():
+                        attempt = 0
+                        if message['type'] in ('message', 'pmessage'):
+                            await self._handle_message(message)
+                        if not self.running:
+                            break
+                    else:
+                        self._has_subscriptions.clear()
+                except (RedisConnectionError, RedisTimeoutError, OSError) as e:
+                    if not self.running:
+                        break
+                    delay = min(0.5 * 2 ** attempt, 30.0)
+                    attempt += 1
+                    logger.warning(f"Event bus connection lost ({e}), reconnecting in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+                    await self._resubscribe()
                     
+        except asyncio.CancelledError:
+            pass
         except Exception as e:
             logger.error(f"Error in event loop: {e}")
         finally:
             logger.info("Stopped listening for events")
     
+    async def _resubscribe(self):
+        """Replace the pubsub connection and restore every channel and pattern"""
+        old = self.pubsub
+        self.pubsub = self.redis.pubsub()
+        try:
+            await old.close()
+        except Exception:
+            pass
+        try:
+            channels = [c for c in self.subscribers if not is_pattern(c)]
+            patterns = [c for c in self.subscribers if is_pattern(c)]
+            if channels:
+                await self.pubsub.subscribe(*channels)
+            if patterns:
+                await self.pubsub.psubscribe(*patterns)
+            self.reconnects += 1
+            logger.info(f"Resubscribed to {len(channels)} channels and {len(patterns)} patterns")
+        except (RedisConnectionError, RedisTimeoutError, OSError) as e:
+            logger.warning(f"Resubscribe failed: {e}")
+    
+    async def _listen_streams(self):
+        """Consume subscribed streams through the consumer group, reconnecting with backoff"""
+        if not self.streams:
+            await self.connect()
+        
+        self.running = True
+        logger.info(f"Started listening for stream events as {self.streams.consumer}")
+        claim_interval = settings.event_bus_stream_claim_idle_ms / 2000
+        last_claim = time.monotonic()
+        replay = True
+        attempt = 0
+        
+        try:
+            while self.running:
+                try:
+                    if replay:
+                        # Our own delivered-but-unacked entries, at startup and after a reconnect
+                        for entry in await self.streams.read_pending(list(self.subscribers)):
+                            await self._handle_entry(*entry)
+                        replay = False
+                    
+                    await self.streams.flush_acks()
+                    # Backpressure: skip streams whose "block" subscribers are
+                    # backed up; their entries wait in Redis until there is room
+                    channels = [
+                        channel for channel, subscriptions in self.subscribers.items()
+                        if not any(subscription.backlogged for subscription in subscriptions)
+                    ]
+                    if not channels:
+                        await asyncio.sleep(settings.event_bus_stream_block_ms / 1000)
+                        continue
+                    
+                    for entry in await self.streams.read(channels):
+                        await self._handle_entry(*entry)
+                    attempt = 0
+                    
+                    if time.monotonic() - last_claim >= claim_interval:
+                        last_claim = time.monotonic()
+                        for entry in await self.streams.reclaim(channels):
+                            await self._handle_entry(*entry)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    if not self.running:
+                        break
+                    delay = min(0.5 * 2 ** attempt, 30.0)
+                    attempt += 1
+                    logger.warning(f"Stream listener failed ({e!r}), reconnecting in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+                    await self._regroup()
+                    replay = True
+                    
+        except asyncio.CancelledError:
+            pass
+        finally:
+            logger.info("Stopped listening for stream events")
+    
+    async def _regroup(self):
+        """Recreate the consumer groups (Redis may have restarted without them)"""
+        self.streams.reset_groups()
+        try:
+            for channel in list(self.subscribers):
+                await self.streams.ensure_group(channel)
+            self.reconnects += 1
+            logger.info(f"Restored consumer groups on {len(self.subscribers)} streams")
+        except Exception as e:
+            logger.warning(f"Restoring consumer groups failed: {e}")
+    
+    async def _handle_entry(self, channel: str, message_id: bytes, payload: Optional[bytes]):
+        """Dispatch a stream entry to the subscribers that still need it; acked once all handled it"""
+        if payload is None:
+            # Trimmed away while pending: nothing left to deliver
+            self.streams.ack(channel, message_id)
+            return
+        try:
+            data = codecs.decode(payload)
+        except Exception as e:
+            logger.error(f"Dropping undecodable entry {message_id} on {channel}: {e}")
+            self.streams.ack(channel, message_id)
+            return
+        self._record_lag(data)
+        subscriptions = self.subscribers.get(channel, [])
+        for subscription, on_done in self.streams.ack_when_done(channel, message_id, subscriptions).items():
+            subscription.put(channel, data, on_done)
+    
     async def _handle_message(self, message):
-        """Handle incoming message"""
+        """Decode a message and queue it for every subscriber of its channel or pattern"""
         try:
             channel = message['channel'].decode('utf-8')
-            data = json.loads(message['data'].decode('utf-8'))
+            data = codecs.decode(message['data'])
+            key = message['pattern'].decode('utf-8') if message.get('pattern') else channel
+            self._record_lag(data)
             
-            if channel in self.subscribers:
-                for callback in self.subscribers[channel]:
-                    await callback(channel, data)
+            # Only enqueue here (put never waits); callbacks run on each
+            # subscription's workers so one slow subscriber cannot stall the
+            # listener or the others
+            for subscription in self.subscribers.get(key, []):
+                subscription.put(channel, data)
                     
         except Exception as e:
             logger.error(f"Error handling message: {e}")
 
+    def _record_lag(self, data: Dict[str, Any]):
+        """Publish-to-listener delay from the ``timestamp`` added by ``publish``"""
+        try:
+            published = datetime.fromisoformat(data["timestamp"])
+        except (KeyError, TypeError, ValueError):
+            return
+        # Naive stamps come from publishers predating UTC stamps (local time)
+        now = datetime.now() if published.tzinfo is None else datetime.now(timezone.utc)
+        self.lag.record(max((now - published).total_seconds() * 1000, 0.0))
+    
+    async def stats(self) -> Dict[str, Any]:
+        """Per-subscriber queue depth, drops and callback latency, plus transport counters"""
+        stats = {
+            "transport": self.transport,
+            "listener_lag": self.lag.to_dict(),
+            "reconnects": self.reconnects,
+            "subscribers": {
+                channel: [subscription.stats() for subscription in subscriptions]
+                for channel, subscriptions in self.subscribers.items()
+            },
+        }
+        if self.publisher:
+            stats["publisher"] = self.publisher.stats()
+        if self.streams:
+            stats["streams"] = await self.streams.stats()
+        return stats
+
 # Global event bus instance
-event_bus = EventBus()
+event_bus = EventBus(settings.redis_url)
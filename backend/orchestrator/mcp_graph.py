@@ -1,14 +1,39 @@
+import asyncio
+import logging
+from typing import AsyncIterator, Callable, Dict, List, NamedTuple, Optional, Tuple
+
 from langgraph.graph import StateGraph, END
 from langchain_core.runnables import RunnableLambda
 
+from config import settings
+from langgraph_mcp.parallel import run_branches
+from orchestrator.agent_clients import get_agent_client
+from orchestrator.graph_registry import graph_registry
+
+logger = logging.getLogger(__name__)
+
 # Dummy agent functions — replace with actual logic
 def chart_analyst_node(state: dict) -> dict:
     print("?? Running chart analyst")
     return {**state, "chart_analysis": f"Chart analysis for {state['symbol']} on {state['timeframe']}"}
 
+def compute_macro_context(timeframe: str) -> dict:
+    """Macro context shared by every symbol on a timeframe"""
+    return {"timeframe": timeframe, "summary": f"Macro context for {timeframe}"}
+
 def macro_forecaster_node(state: dict) -> dict:
     print("?? Running macro forecaster")
-    return {**state, "macro_outlook": f"Macro outlook for {state['symbol']}"}
+    # Batches precompute the macro context once per timeframe
+    macro_context = state.get("macro_context") or compute_macro_context(state["timeframe"])
+    return {
+        **state,
+        "macro_context": macro_context,
+        "macro_outlook": f"Macro outlook for {state['symbol']}",
+    }
+
+def market_sentinel_node(state: dict) -> dict:
+    logger.debug("Running market sentinel")
+    return {**state, "market_conditions": f"Market conditions for {state['symbol']}"}
 
 def risk_manager_node(state: dict) -> dict:
     print("⚠️ Running risk manager")
@@ -19,27 +44,217 @@ def tactic_bot_node(state: dict) -> dict:
     decision = f"Execute BUY order on {state['symbol']}" if "EURUSD" in state["symbol"] else "HOLD"
     return {**state, "decision": decision}
 
-# ✅ Main MCP function called by FastAPI
-async def run_mcp_pipeline(symbol: str, timeframe: str) -> dict:
-    initial_state = {"symbol": symbol, "timeframe": timeframe}
+STUB_NODES = {
+    "chart_analyst": chart_analyst_node,
+    "macro_forecaster": macro_forecaster_node,
+    "market_sentinel": market_sentinel_node,
+    "risk_manager": risk_manager_node,
+    "tactic_bot": tactic_bot_node,
+}
+
+# Analysts that do not depend on each other's output
+ANALYSTS = ("chart_analyst", "macro_forecaster", "market_sentinel")
+
+# Steps of the sequential pipeline, in order
+SEQUENTIAL_STEPS = ("chart_analyst", "macro_forecaster", "risk_manager", "tactic_bot")
+
+class AgentNodeSpec(NamedTuple):
+    agent: str  # agent service, e.g. "riskmanager"
+    data: Callable[[dict], dict]  # AgentInput.data built from the pipeline state
+    output_key: str  # state key the AgentOutput is stored under
+
+def _agent_signals(state: dict) -> List[dict]:
+    keys = ("chart_analysis", "macro_outlook", "market_conditions", "risk_score")
+    return [state[k] for k in keys if isinstance(state.get(k), dict)]
+
+# Pipeline node -> agent call; output keys match the placeholder nodes
+AGENT_NODE_SPECS = {
+    "chart_analyst": AgentNodeSpec("chartanalyst", lambda s: {"candles": s.get("candles")}, "chart_analysis"),
+    "macro_forecaster": AgentNodeSpec(
+        "macroforecaster",
+        lambda s: {"news": s.get("news", []), "economic_events": s.get("economic_events", [])},
+        "macro_outlook",
+    ),
+    "market_sentinel": AgentNodeSpec(
+        "marketsentinel",
+        lambda s: {"market_data": s.get("market_data", {}), "volatility": s.get("volatility", {})},
+        "market_conditions",
+    ),
+    "risk_manager": AgentNodeSpec(
+        "riskmanager",
+        lambda s: {"portfolio": s.get("portfolio", {}), "signal": s.get("chart_analysis") or {}},
+        "risk_score",
+    ),
+    "tactic_bot": AgentNodeSpec(
+        "tacticbot",
+        lambda s: {"agent_signals": _agent_signals(s), "market_conditions": s.get("market_conditions") or {}},
+        "tactics",
+    ),
+}
+
+def make_agent_node(name: str, client) -> Callable:
+    """Pipeline node that calls an agent through ``client`` (HTTP or in-process)"""
+    spec = AGENT_NODE_SPECS[name]
+
+    async def node(state: dict) -> dict:
+        result = dict(state)
+        if name == "macro_forecaster":
+            result["macro_context"] = state.get("macro_context") or compute_macro_context(state["timeframe"])
+        output = await client.analyze(spec.agent, {
+            "symbol": state["symbol"],
+            "timeframe": state["timeframe"],
+            "data": spec.data(state),
+            "context": result.get("macro_context"),
+        })
+        result[spec.output_key] = output
+        if name == "tactic_bot":
+            side = output.get("signal_type")
+            result["decision"] = f"Execute {side} order on {state['symbol']}" if side in ("BUY", "SELL") else "HOLD"
+            result["confidence"] = output.get("confidence")
+        return result
+
+    node.__name__ = f"{name}_node"
+    return node
+
+def pipeline_nodes(agent_mode: str = settings.agent_execution_mode) -> Dict[str, Callable]:
+    """Node functions for every pipeline step under ``agent_mode``"""
+    client = get_agent_client(agent_mode)
+    if client is None:
+        return dict(STUB_NODES)
+    return {name: make_agent_node(name, client) for name in STUB_NODES}
 
-    # Build the graph
+def make_analysts_node(analysts: Dict[str, Callable]) -> Callable:
+    async def analysts_node(state: dict) -> dict:
+        """Run the independent analysts concurrently and join their outputs"""
+        results, skipped = await run_branches(
+            analysts, lambda: dict(state), timeout=settings.mcp_branch_timeout
+        )
+        merged = dict(state)
+        for output in results.values():
+            merged.update(output)
+        merged["skipped_agents"] = skipped
+        return merged
+    return analysts_node
+
+def make_step_node(name: str, node: Callable) -> Callable:
+    async def step_node(state: dict) -> dict:
+        """Run one pipeline step under the analysts' policy: a failure or timeout skips it"""
+        results, skipped = await run_branches(
+            {name: node}, lambda: dict(state), timeout=settings.mcp_branch_timeout
+        )
+        if not skipped:
+            return results[name]
+        result = {**state, "skipped_agents": [*state.get("skipped_agents", []), *skipped]}
+        if name == "tactic_bot":
+            result["decision"] = "HOLD"  # no tactics, no trade
+        return result
+    step_node.__name__ = f"{name}_step"
+    return step_node
+
+MCP_GRAPH_NAME = "mcp"
+MCP_GRAPH_VERSION = "3"
+
+def build_mcp_graph(
+    mode: str = settings.mcp_execution_mode, agent_mode: str = settings.agent_execution_mode
+) -> StateGraph:
+    """Build the (uncompiled) MCP pipeline topology"""
     builder = StateGraph(dict)
+    nodes = pipeline_nodes(agent_mode)
+
+    if mode == "dag":
+        # Fan out to the analysts, then join before risk and tactics
+        analysts = make_analysts_node({name: nodes[name] for name in ANALYSTS})
+        builder.add_node("analysts", RunnableLambda(analysts))
+        builder.add_node("risk_manager", RunnableLambda(make_step_node("risk_manager", nodes["risk_manager"])))
+        builder.add_node("tactic_bot", RunnableLambda(make_step_node("tactic_bot", nodes["tactic_bot"])))
 
-    # Add nodes
-    builder.add_node("chart_analyst", RunnableLambda(chart_analyst_node))
-    builder.add_node("macro_forecaster", RunnableLambda(macro_forecaster_node))
-    builder.add_node("risk_manager", RunnableLambda(risk_manager_node))
-    builder.add_node("tactic_bot", RunnableLambda(tactic_bot_node))
+        builder.set_entry_point("analysts")
+        builder.add_edge("analysts", "risk_manager")
+    elif mode == "sequential":
+        # The original chain; MarketSentinel only runs in the DAG fan-out
+        for name in SEQUENTIAL_STEPS:
+            builder.add_node(name, RunnableLambda(make_step_node(name, nodes[name])))
+
+        # Set node execution order
+        builder.set_entry_point("chart_analyst")
+        builder.add_edge("chart_analyst", "macro_forecaster")
+        builder.add_edge("macro_forecaster", "risk_manager")
+    else:
+        raise ValueError(f"Unknown MCP execution mode: {mode}")
 
-    # Set node execution order
-    builder.set_entry_point("chart_analyst")
-    builder.add_edge("chart_analyst", "macro_forecaster")
-    builder.add_edge("macro_forecaster", "risk_manager")
     builder.add_edge("risk_manager", "tactic_bot")
     builder.set_finish_point("tactic_bot")
 
-    # Compile and run
-    graph = builder.compile()
-    result = await graph.ainvoke(initial_state)
-    return result
+    return builder
+
+def register_mcp_graph(mode: str = settings.mcp_execution_mode, agent_mode: str = settings.agent_execution_mode):
+    """Make ``mode`` the active MCP topology (hot-swaps if already registered)"""
+    graph_registry.register(
+        MCP_GRAPH_NAME,
+        lambda: build_mcp_graph(mode, agent_mode),
+        version=f"{MCP_GRAPH_VERSION}-{mode}-{agent_mode}",
+    )
+
+# Compiled lazily on first use (or at startup via graph_registry.warmup())
+register_mcp_graph()
+
+def signal_row(result: dict) -> dict:
+    """trade_signals column values for a finished pipeline run.
+
+    ``agent_id`` is intentionally left NULL: the signal is the pipeline's
+    joint decision, and each agent's own output is kept in ``signal_data``.
+    """
+    decision = str(result.get("decision", ""))
+    signal_type = next((side for side in ("BUY", "SELL") if side in decision), "HOLD")
+    return {
+        "symbol": result["symbol"],
+        "timeframe": result["timeframe"],
+        "signal_type": signal_type,
+        "confidence": result.get("confidence"),
+        "signal_data": {
+            "reasoning": decision,
+            **{k: v for k, v in result.items() if k not in ("macro_context", "symbol", "timeframe")},
+        },
+        "macro_context": result.get("macro_context"),
+    }
+
+# ✅ Main MCP function called by FastAPI
+async def run_mcp_pipeline(symbol: str, timeframe: str, shared: Optional[dict] = None) -> dict:
+    initial_state = {**(shared or {}), "symbol": symbol, "timeframe": timeframe}
+    return await graph_registry.ainvoke(MCP_GRAPH_NAME, initial_state)
+
+async def run_mcp_batch(
+    items: List[Tuple[str, str]], max_concurrency: int = settings.mcp_batch_concurrency
+) -> AsyncIterator[Dict]:
+    """Run the pipeline for many (symbol, timeframe) pairs, yielding as each finishes.
+
+    At most ``max_concurrency`` pipelines run at once. Per-timeframe work
+    (macro context) is computed once for the whole batch. Each yielded item
+    carries its ``index`` in ``items`` and either a ``result`` or an ``error``.
+    """
+    shared = {
+        timeframe: {"macro_context": await asyncio.to_thread(compute_macro_context, timeframe)}
+        for timeframe in {timeframe for _, timeframe in items}
+    }
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run_one(index: int, symbol: str, timeframe: str) -> Dict:
+        async with semaphore:
+            entry = {"index": index, "symbol": symbol, "timeframe": timeframe}
+            try:
+                entry["result"] = await run_mcp_pipeline(symbol, timeframe, shared[timeframe])
+            except Exception as e:
+                entry["error"] = str(e)
+            return entry
+
+    tasks = [
+        asyncio.create_task(run_one(index, symbol, timeframe))
+        for index, (symbol, timeframe) in enumerate(items)
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Client went away mid-stream: stop the pipelines still queued
+        for task in tasks:
+            task.cancel()
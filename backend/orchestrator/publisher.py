@@ -0,0 +1,100 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+FLUSH_SIZE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+FLUSH_LATENCY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 20, 50, 100, 250, 500, 1000)
+
+
+class BatchPublisher:
+    """Micro-batches publishes into one Redis pipeline round trip.
+
+    ``submit`` queues a ``(channel, payload)`` pair and resolves once the
+    batch holding it has been sent, with that message's own result or
+    error. A batch is flushed when it reaches ``max_batch`` messages or
+    ``linger_ms`` after its first message, whichever comes first.
+    ``send_batch`` receives the pairs and returns one result per pair;
+    an exception in the result list fails only that message.
+    """
+
+    def __init__(
+        self,
+        send_batch: Callable[[List[Tuple[str, bytes]]], Awaitable[List[Any]]],
+        max_batch: int = 100,
+        linger_ms: float = 2.0,
+    ):
+        self.send_batch = send_batch
+        self.max_batch = max(1, max_batch)
+        self.linger_ms = linger_ms
+        self._pending: List[Tuple[str, bytes, asyncio.Future]] = []
+        self._timer = None
+        self._flushes = set()
+        self.flush_size = Histogram(FLUSH_SIZE_BUCKETS)
+        self.flush_latency = Histogram(FLUSH_LATENCY_BUCKETS_MS)
+        self.metrics = {"messages": 0, "flushes": 0, "errors": 0}
+
+    async def submit(self, channel: str, payload: bytes) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((channel, payload, future))
+        if len(self._pending) >= self.max_batch:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._linger())
+        return await future
+
+    async def _linger(self):
+        await asyncio.sleep(self.linger_ms / 1000)
+        self._timer = None
+        self._start_flush()
+
+    def _start_flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        task = asyncio.create_task(self._flush(batch))
+        # Keep a reference so in-flight flushes are not garbage collected
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: List[Tuple[str, bytes, asyncio.Future]]):
+        start = time.perf_counter()
+        try:
+            results = await self.send_batch([(channel, payload) for channel, payload, _ in batch])
+        except Exception as e:
+            results = [e] * len(batch)
+            logger.error(f"Failed to publish batch of {len(batch)}: {e}")
+        self.flush_latency.observe((time.perf_counter() - start) * 1000)
+        self.flush_size.observe(len(batch))
+        self.metrics["flushes"] += 1
+        self.metrics["messages"] += len(batch)
+
+        for (_, _, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                self.metrics["errors"] += 1
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def flush(self):
+        """Send anything buffered and wait for in-flight batches"""
+        self._start_flush()
+        if self._flushes:
+            await asyncio.gather(*list(self._flushes), return_exceptions=True)
+
+    def stats(self) -> Dict:
+        return {
+            **self.metrics,
+            "buffered": len(self._pending),
+            "flush_size": self.flush_size.to_dict(),
+            "flush_latency_ms": self.flush_latency.to_dict(),
+        }
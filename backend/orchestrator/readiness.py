@@ -0,0 +1,80 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Probe = Callable[[], Awaitable]
+
+# Component states reported by /ready
+STARTING = "starting"
+READY = "ready"
+UNAVAILABLE = "unavailable"
+
+
+class Readiness:
+    """Brings dependencies up in the background and reports whether we can take traffic.
+
+    Each component has a cheap ``probe`` (e.g. ``SELECT 1``). ``start`` retries
+    the probe with exponential backoff until it succeeds, then runs the
+    component's one-off ``on_ready`` setup (e.g. creating tables). Nothing
+    here blocks startup: the app serves ``/health`` straight away and
+    ``/ready`` answers 503 until every component is up.
+    """
+
+    def __init__(self, retry_initial: float = 0.5, retry_max: float = 30.0, probe_timeout: float = 2.0):
+        self.retry_initial = retry_initial
+        self.retry_max = retry_max
+        self.probe_timeout = probe_timeout
+        self.components: Dict[str, Dict] = {}
+        self._probes: Dict[str, Probe] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self, name: str, probe: Probe, on_ready: Optional[Probe] = None):
+        """Bring ``name`` up in a background task"""
+        self._probes[name] = probe
+        self.components[name] = {"status": STARTING, "attempts": 0, "last_error": None, "ready_at": None}
+        self._tasks.append(asyncio.create_task(self._bring_up(name, probe, on_ready)))
+
+    async def _bring_up(self, name: str, probe: Probe, on_ready: Optional[Probe]):
+        component = self.components[name]
+        delay = self.retry_initial
+        while True:
+            component["attempts"] += 1
+            try:
+                await asyncio.wait_for(probe(), self.probe_timeout)
+                if on_ready:
+                    await on_ready()
+                component.update(status=READY, last_error=None, ready_at=datetime.now().isoformat())
+                logger.info(f"✅ {name} ready after {component['attempts']} attempt(s)")
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                component["last_error"] = repr(e)
+                logger.warning(f"⏳ {name} not ready (attempt {component['attempts']}): {e}; retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.retry_max)
+
+    async def check(self) -> Tuple[bool, Dict]:
+        """Re-probe the components that have come up; returns (all ready, per-component status)"""
+        names = [name for name, c in self.components.items() if c["status"] != STARTING]
+        results = await asyncio.gather(
+            *(asyncio.wait_for(self._probes[name](), self.probe_timeout) for name in names),
+            return_exceptions=True,
+        )
+        for name, result in zip(names, results):
+            component = self.components[name]
+            if isinstance(result, BaseException):
+                component.update(status=UNAVAILABLE, last_error=repr(result))
+            else:
+                component["status"] = READY
+        ready = all(c["status"] == READY for c in self.components.values())
+        return ready, {name: dict(c) for name, c in self.components.items()}
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
@@ -0,0 +1,234 @@
+import logging
+import socket
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from redis.exceptions import ResponseError
+
+logger = logging.getLogger(__name__)
+
+# (channel, message id, raw payload)
+StreamEntry = Tuple[str, bytes, Optional[bytes]]
+
+
+class StreamTransport:
+    """Redis Streams backend for ``EventBus``.
+
+    Each channel is a stream (``prefix + channel``) read through a consumer
+    group, so orchestrator replicas sharing a group split the messages
+    between them. Entries are acked once every subscriber has handled them;
+    acks are batched and sent on the next read. Until then the transport
+    remembers which subscribers have an entry queued or handled, so a
+    redelivery to this consumer only reaches the ones that still need it
+    (a redelivery to another replica reaches all of its subscribers).
+    Entries left pending by a
+    crashed or stuck consumer are claimed after ``claim_idle_ms``, and
+    entries delivered ``max_deliveries`` times are acked and logged instead
+    of being retried forever. On restart a consumer first re-reads its own
+    pending entries, so nothing read but unprocessed is lost.
+    """
+
+    def __init__(
+        self,
+        redis,
+        group: str,
+        consumer: Optional[str] = None,
+        prefix: str = "stream:",
+        maxlen: Optional[int] = 10000,
+        batch_size: int = 100,
+        block_ms: int = 1000,
+        claim_idle_ms: int = 30000,
+        max_deliveries: int = 5,
+    ):
+        self.redis = redis
+        self.group = group
+        self.consumer = consumer or socket.gethostname()
+        self.prefix = prefix
+        self.maxlen = maxlen
+        self.batch_size = batch_size
+        self.block_ms = block_ms
+        self.claim_idle_ms = claim_idle_ms
+        self.max_deliveries = max_deliveries
+        self._groups = set()
+        self._acks: Dict[str, List[bytes]] = defaultdict(list)
+        # (channel, message id) -> subscribers with the entry queued / handled
+        self._tracked: Dict[Tuple[str, bytes], Dict[str, Set[Any]]] = {}
+        self.metrics = {
+            "published": 0,
+            "read": 0,
+            "read_batches": 0,
+            "acked": 0,
+            "reclaimed": 0,
+            "dead_lettered": 0,
+        }
+
+    def _key(self, channel: str) -> str:
+        return f"{self.prefix}{channel}"
+
+    def _channel(self, key) -> str:
+        key = key.decode("utf-8") if isinstance(key, bytes) else key
+        return key[len(self.prefix):]
+
+    async def publish(self, channel: str, payload: bytes):
+        message_id = await self.redis.xadd(self._key(channel), {"data": payload}, maxlen=self.maxlen, approximate=True)
+        self.metrics["published"] += 1
+        return message_id
+
+    async def publish_many(self, entries: List[Tuple[str, bytes]]) -> List:
+        """XADD a batch of (channel, payload) in one pipeline; returns ids or errors"""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for channel, payload in entries:
+                pipe.xadd(self._key(channel), {"data": payload}, maxlen=self.maxlen, approximate=True)
+            results = await pipe.execute(raise_on_error=False)
+        self.metrics["published"] += sum(not isinstance(r, Exception) for r in results)
+        return results
+
+    async def ensure_group(self, channel: str):
+        """Create the consumer group (and stream) if missing"""
+        if channel in self._groups:
+            return
+        try:
+            # Start at 0 so entries published before the group existed are read too
+            await self.redis.xgroup_create(self._key(channel), self.group, id="0", mkstream=True)
+            logger.info(f"Created consumer group {self.group} on {self._key(channel)}")
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._groups.add(channel)
+
+    def _entries(self, response) -> List[StreamEntry]:
+        entries = []
+        for key, messages in response or []:
+            channel = self._channel(key)
+            for message_id, fields in messages:
+                entries.append((channel, message_id, (fields or {}).get(b"data")))
+        return entries
+
+    async def read(self, channels: List[str]) -> List[StreamEntry]:
+        """Block for up to ``block_ms`` and return a batch of new entries"""
+        response = await self.redis.xreadgroup(
+            self.group,
+            self.consumer,
+            {self._key(c): ">" for c in channels},
+            count=self.batch_size,
+            block=self.block_ms,
+        )
+        entries = self._entries(response)
+        if entries:
+            self.metrics["read"] += len(entries)
+            self.metrics["read_batches"] += 1
+        return entries
+
+    async def read_pending(self, channels: List[str]) -> List[StreamEntry]:
+        """This consumer's delivered-but-unacked entries, e.g. after a restart"""
+        entries = []
+        for channel in channels:
+            last_id = "0"
+            while True:
+                response = await self.redis.xreadgroup(
+                    self.group, self.consumer, {self._key(channel): last_id}, count=self.batch_size
+                )
+                batch = self._entries(response)
+                if not batch:
+                    break
+                entries.extend(batch)
+                last_id = batch[-1][1]
+        if entries:
+            logger.info(f"Replaying {len(entries)} pending stream entries for {self.consumer}")
+        return entries
+
+    async def reclaim(self, channels: List[str]) -> List[StreamEntry]:
+        """Claim entries other consumers left idle for ``claim_idle_ms``"""
+        entries = []
+        for channel in channels:
+            key = self._key(channel)
+            pending = await self.redis.xpending_range(
+                key, self.group, min="-", max="+", count=self.batch_size, idle=self.claim_idle_ms
+            )
+            dead = [p["message_id"] for p in pending if p["times_delivered"] >= self.max_deliveries]
+            retry = [p["message_id"] for p in pending if p["times_delivered"] < self.max_deliveries]
+            if dead:
+                await self.redis.xack(key, self.group, *dead)
+                for message_id in dead:
+                    self._tracked.pop((channel, message_id), None)
+                self.metrics["dead_lettered"] += len(dead)
+                logger.warning(f"Dropped {len(dead)} entries from {key} after {self.max_deliveries} deliveries")
+            if retry:
+                claimed = await self.redis.xclaim(key, self.group, self.consumer, self.claim_idle_ms, retry)
+                batch = [(channel, message_id, (fields or {}).get(b"data")) for message_id, fields in claimed]
+                self.metrics["reclaimed"] += len(batch)
+                entries.extend(batch)
+        return entries
+
+    def ack_when_done(self, channel: str, message_id: bytes, subscribers: List[Any]) -> Dict[Any, Callable[[bool], None]]:
+        """Completion hooks for the ``subscribers`` that still need this entry.
+
+        Subscribers that already have it queued or handled are left out. The
+        entry is acked once every subscriber has handled it; one that fails
+        is forgotten, so the next delivery retries only that subscriber.
+        """
+        subscribers = list(subscribers)
+        key = (channel, message_id)
+        tracked = self._tracked.setdefault(key, {"queued": set(), "handled": set()})
+        queued, handled = tracked["queued"], tracked["handled"]
+
+        def hook(subscriber) -> Callable[[bool], None]:
+            def done(ok: bool):
+                queued.discard(subscriber)
+                if ok:
+                    handled.add(subscriber)
+                    if all(s in handled for s in subscribers):
+                        self.ack(channel, message_id)
+            return done
+
+        pending = [s for s in subscribers if s not in queued and s not in handled]
+        if not pending and all(s in handled for s in subscribers):
+            self.ack(channel, message_id)
+            return {}
+        queued.update(pending)
+        return {subscriber: hook(subscriber) for subscriber in pending}
+
+    def ack(self, channel: str, message_id: bytes):
+        # Tracking is kept until the ack is flushed, so a redelivery that
+        # races the flush still finds the entry handled
+        self._acks[channel].append(message_id)
+
+    def reset_groups(self):
+        """Forget which groups exist, e.g. after Redis restarted without its data"""
+        self._groups.clear()
+
+    async def flush_acks(self):
+        """Send queued acks in one pipeline round trip"""
+        if not self._acks:
+            return
+        acks, self._acks = self._acks, defaultdict(list)
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for channel, ids in acks.items():
+                    pipe.xack(self._key(channel), self.group, *ids)
+                results = await pipe.execute()
+        except Exception:
+            # Keep them for the next flush rather than leaving entries pending
+            for channel, ids in acks.items():
+                self._acks[channel][:0] = ids
+            raise
+        for channel, ids in acks.items():
+            for message_id in ids:
+                self._tracked.pop((channel, message_id), None)
+        self.metrics["acked"] += sum(results)
+
+    async def stats(self) -> Dict:
+        lag = {}
+        for channel in self._groups:
+            try:
+                summary = await self.redis.xpending(self._key(channel), self.group)
+                lag[channel] = summary["pending"]
+            except ResponseError:
+                lag[channel] = None
+        return {
+            "group": self.group,
+            "consumer": self.consumer,
+            "pending": lag,
+            "tracked": len(self._tracked),
+            **self.metrics,
+        }